@@ -28,6 +28,7 @@ from __future__ import annotations
 
 # pylint:disable=too-many-public-methods, too-many-instance-attributes, invalid-name
 # pylint:disable=too-few-public-methods, too-many-lines, too-many-arguments
+import array
 import gc
 import math
 import time
@@ -35,12 +36,39 @@ import time
 import displayio
 
 try:
-    from typing import List, Optional, Tuple, Union
+    from typing import BinaryIO, List, Optional, Tuple, Union
 
     import busdisplay
 except ImportError:
     pass
 
+try:
+    from supervisor import ticks_ms as _ticks_ms
+except ImportError:
+
+    def _ticks_ms() -> int:
+        return int(time.monotonic() * 1000)
+
+
+# supervisor.ticks_ms() wraps around at 2**29
+_TICKS_MASK = (1 << 29) - 1
+
+# the opcodes of the commands turtle.receive() carries out, as sent by
+# adafruit_turtle_host.CommandEncoder
+_OP_END = 0
+_OP_GOTO = 1
+_OP_FORWARD = 2
+_OP_LEFT = 3
+_OP_AGAIN = 4
+_OP_PENUP = 5
+_OP_PENDOWN = 6
+_OP_PENSIZE = 7
+_OP_PENCOLOR = 8
+_OP_SETHEADING = 9
+_OP_DOT = 10
+_OP_CLEAR = 11
+_OP_CIRCLE = 12
+
 __version__ = "0.0.0+auto.0"
 __repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_turtle.git"
 
@@ -211,10 +239,312 @@ class Vec2D:
         return f"({self[0]:.2f},{self[1]:.2f})"
 
 
+class TiledCanvas:
+    """A drawing canvas larger than the display, made of square tiles.
+
+    Tiles are only allocated when a pixel in them is first drawn. At most
+    ``max_tiles`` are kept in a shared tile sheet bitmap; when more are
+    needed the least recently drawn one that is off-screen is run-length
+    encoded into a compact store, and decoded again when it is next drawn
+    on or scrolled into view. ``tilegrid`` shows the visible part of the
+    canvas, so scrolling only swaps tile indices.
+
+    Reading and writing pixels works like a `displayio.Bitmap`.
+
+    :param width: the width of the canvas, in pixels
+    :param height: the height of the canvas, in pixels
+    :param view_width: the width of the visible part, in pixels
+    :param view_height: the height of the visible part, in pixels
+    :param pixel_shader: the palette used to show the canvas
+    :param value_count: the number of distinct pixel values
+    :param tile_size: the width and height of a tile, in pixels
+    :param max_tiles: how many tiles to keep in memory (by default enough
+     for the view and one more row of tiles); the tiles covering the view
+     and at least one more are needed
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        view_width: int,
+        view_height: int,
+        pixel_shader: displayio.Palette,
+        value_count: int = 16,
+        tile_size: int = 32,
+        max_tiles: Optional[int] = None,
+    ) -> None:
+        self.width = width
+        self.height = height
+        self._size = tile_size
+        self._cols = (view_width + tile_size - 1) // tile_size + 1
+        self._rows = (view_height + tile_size - 1) // tile_size + 1
+        if max_tiles is None:
+            max_tiles = self._cols * (self._rows + 1)
+        # every tile of the view may be in use, and drawing off-screen needs
+        # one more
+        if max_tiles <= self._cols * self._rows:
+            raise ValueError("max_tiles is too small to cover the view")
+        # slot 0 is a blank tile shown wherever nothing was drawn yet
+        self._sheet = displayio.Bitmap(tile_size * (max_tiles + 1), tile_size, value_count)
+        self._free = list(range(max_tiles, 0, -1))
+        self._slots = {}
+        self._used = {}
+        self._tick = 0
+        self._store = {}
+        self._default = 0
+        self._tx = 0
+        self._ty = 0
+        self.tilegrid = displayio.TileGrid(
+            self._sheet,
+            pixel_shader=pixel_shader,
+            width=self._cols,
+            height=self._rows,
+            tile_width=tile_size,
+            tile_height=tile_size,
+            default_tile=0,
+        )
+
+    def __getitem__(self, index: Tuple[int, int]) -> int:
+        x, y = index
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError("pixel out of bounds")
+        size = self._size
+        key = (x // size, y // size)
+        slot = self._slots.get(key)
+        if slot is None:
+            if key not in self._store:
+                return self._default
+            slot = self._load(key)
+        return self._sheet[slot * size + x % size, y % size]
+
+    def __setitem__(self, index: Tuple[int, int], value: int) -> None:
+        x, y = index
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError("pixel out of bounds")
+        size = self._size
+        key = (x // size, y // size)
+        slot = self._slots.get(key)
+        if slot is None:
+            if value == self._default and key not in self._store:
+                return
+            slot = self._load(key)
+        self._tick += 1
+        self._used[key] = self._tick
+        self._sheet[slot * size + x % size, y % size] = value
+
+    def _visible(self, key: Tuple[int, int]) -> bool:
+        return (
+            self._tx <= key[0] < self._tx + self._cols
+            and self._ty <= key[1] < self._ty + self._rows
+        )
+
+    def _load(self, key: Tuple[int, int]) -> int:
+        """Give the tile a slot in the sheet, decoding it if it was stored"""
+        import bitmaptools
+
+        if not self._free:
+            self._evict()
+        slot = self._free.pop()
+        size = self._size
+        x = slot * size
+        data = self._store.pop(key, None)
+        if data is None:
+            bitmaptools.fill_region(self._sheet, x, 0, x + size, size, self._default)
+        else:
+            p = 0
+            for i in range(0, len(data), 2):
+                count = data[i]
+                while count:
+                    y, dx = divmod(p, size)
+                    span = min(count, size - dx)
+                    bitmaptools.fill_region(
+                        self._sheet, x + dx, y, x + dx + span, y + 1, data[i + 1]
+                    )
+                    p += span
+                    count -= span
+        self._slots[key] = slot
+        self._tick += 1
+        self._used[key] = self._tick
+        if self._visible(key):
+            self.tilegrid[key[0] - self._tx, key[1] - self._ty] = slot
+        return slot
+
+    def _evict(self) -> None:
+        """Move the least recently drawn off-screen tile to the store"""
+        oldest = None
+        for key, tick in self._used.items():
+            if not self._visible(key) and (oldest is None or tick < self._used[oldest]):
+                oldest = key
+        if oldest is None:
+            raise MemoryError("No tile can be evicted")
+        slot = self._slots.pop(oldest)
+        del self._used[oldest]
+        size = self._size
+        sheet = self._sheet
+        data = bytearray()
+        value = sheet[slot * size, 0]
+        count = 0
+        for y in range(size):
+            for x in range(slot * size, slot * size + size):
+                v = sheet[x, y]
+                if v != value or count == 255:
+                    data.append(count)
+                    data.append(value)
+                    value = v
+                    count = 0
+                count += 1
+        data.append(count)
+        data.append(value)
+        if len(data) > 2 or value != self._default:
+            self._store[oldest] = bytes(data)
+        self._free.append(slot)
+
+    def fill(self, value: int) -> None:
+        """Set every pixel of the canvas to value, dropping all tiles.
+
+        :param value: the pixel value
+        """
+        import bitmaptools
+
+        self._default = value
+        self._store = {}
+        self._free.extend(self._slots.values())
+        self._slots = {}
+        self._used = {}
+        bitmaptools.fill_region(self._sheet, 0, 0, self._size, self._size, value)
+        for j in range(self._rows):
+            for i in range(self._cols):
+                self.tilegrid[i, j] = 0
+
+    def recolor(self, old: int, new: int) -> None:
+        """Change every pixel of value old to new.
+
+        :param old: the pixel value to replace
+        :param new: the pixel value to use instead
+        """
+        size = self._size
+        sheet = self._sheet
+        for slot in [0] + list(self._slots.values()):
+            for y in range(size):
+                for x in range(slot * size, slot * size + size):
+                    if sheet[x, y] == old:
+                        sheet[x, y] = new
+        for key, packed in list(self._store.items()):
+            data = bytearray(packed)
+            for i in range(1, len(data), 2):
+                if data[i] == old:
+                    data[i] = new
+            self._store[key] = bytes(data)
+        if self._default == old:
+            self._default = new
+
+    def scroll(self, x: int, y: int) -> None:
+        """Show the part of the canvas whose top left corner is (x, y).
+
+        :param x: the canvas column shown at the left of the view
+        :param y: the canvas row shown at the top of the view
+        """
+        size = self._size
+        self._tx = x // size
+        self._ty = y // size
+        self.tilegrid.x = self._tx * size - x
+        self.tilegrid.y = self._ty * size - y
+        for j in range(self._rows):
+            for i in range(self._cols):
+                key = (self._tx + i, self._ty + j)
+                slot = self._slots.get(key)
+                if slot is None:
+                    slot = self._load(key) if key in self._store else 0
+                self.tilegrid[i, j] = slot
+
+
+class _UndoRecorder:
+    """Stands in for the canvas while a command runs, writing through to
+    the bitmap and run-length encoding the pixels it overwrites"""
+
+    def __init__(self, bitmap: displayio.Bitmap) -> None:
+        self.bitmap = bitmap
+        # flat (x, y, count, old value) runs along a row
+        self.runs = array.array("H")
+
+    def __getitem__(self, index: Tuple[int, int]) -> int:
+        return self.bitmap[index]
+
+    def __setitem__(self, index: Tuple[int, int], value: int) -> None:
+        x, y = index
+        if not (0 <= x < self.bitmap.width and 0 <= y < self.bitmap.height):
+            # nothing to journal; clip or raise exactly like the bitmap does
+            self.bitmap[index] = value
+            return
+        old = self.bitmap[index]
+        if old == value:
+            return
+        self.bitmap[index] = value
+        runs = self.runs
+        if runs and runs[-3] == y and runs[-1] == old and runs[-4] + runs[-2] == x:
+            runs[-2] += 1
+        else:
+            runs.extend((x, y, 1, old))
+
+    def pack(self) -> tuple:
+        """The pixels overwritten, each with the value it had before the
+        first write, as (x, y, count) spans along the rows in row order, and
+        their old values packed two to a byte"""
+        runs = self.runs
+        old = {}
+        for i in range(0, len(runs), 4):
+            start = runs[i + 1] << 16 | runs[i]
+            value = runs[i + 3]
+            for key in range(start, start + runs[i + 2]):
+                if key not in old:
+                    old[key] = value
+        spans = array.array("H")
+        values = bytearray((len(old) + 1) // 2)
+        last = -2
+        for n, key in enumerate(sorted(old)):
+            if key == last + 1:
+                spans[-1] += 1
+            else:
+                spans.extend((key & 0xFFFF, key >> 16, 1))
+            last = key
+            values[n >> 1] |= old[key] << ((n & 1) * 4)
+        return spans, values
+
+
 class turtle:
-    """A Turtle that can be given commands to draw."""
+    """A Turtle that can be given commands to draw.
+
+    :param display: the display to draw on (default: ``board.DISPLAY``)
+    :param scale: how many display pixels each canvas pixel covers, or
+     "auto" to pick the smallest scale (and, if needed, a lower bit depth)
+     whose canvas fits in memory
+    :param bit_depth: bits per canvas pixel: 4 (16 colors), 2 (the first 4
+     colors of `Color.colors`) or 1 (black and white); other colors are
+     drawn as the nearest available one that is not the background color
+    :param memory: with scale "auto", the number of bytes the canvas may
+     use (default: what ``gc.mem_free()`` reports)
+    :param headroom: with scale "auto", bytes to leave free for the rest of
+     the program
+    :param canvas_size: the (width, height) of the canvas in canvas pixels,
+     if it should be larger than the display; the canvas is then a
+     `TiledCanvas` and viewport() scrolls the display over it
+
+    ``canvas_config`` holds the (width, height, scale, bit_depth) of the
+    visible canvas, as chosen with scale "auto".
+    """
 
-    def __init__(self, display: Optional[busdisplay.BusDisplay] = None, scale: float = 1) -> None:
+    def __init__(
+        self,
+        display: Optional[busdisplay.BusDisplay] = None,
+        scale: Union[float, str] = 1,
+        bit_depth: int = 4,
+        memory: Optional[int] = None,
+        headroom: int = 8192,
+        canvas_size: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        if bit_depth not in {1, 2, 4}:
+            raise ValueError("bit_depth must be 1, 2 or 4")
         if display:
             self._display = display
         else:
@@ -227,6 +557,10 @@ class turtle:
 
         self._w: int = self._display.width
         self._h: int = self._display.height
+        if scale == "auto":
+            scale, bit_depth = self._fit_canvas(self._w, self._h, bit_depth, memory, headroom)
+        self.canvas_config = (self._w // int(scale), self._h // int(scale), int(scale), bit_depth)
+        self._colors = Color.colors[: 1 << bit_depth]
         self._x = self._w // (2 * scale)
         self._y = self._h // (2 * scale)
         self._speed = 6
@@ -239,48 +573,55 @@ class turtle:
         self._bg_color = 0
 
         self._splash: displayio.Group = displayio.Group()
-        self._bgscale: int = 1
-        if self._w == self._h:
-            i = 1
-            while self._bgscale == 1:
-                if self._w / i < 128:
-                    self._bg_bitmap = displayio.Bitmap(i, i, 1)
-                    self._bgscale = self._w // i
-                i += 1
-        else:
-            self._bgscale = self._GCD(self._w, self._h)
-            self._bg_bitmap = displayio.Bitmap(
-                self._w // self._bgscale, self._h // self._bgscale, 1
-            )
-        self._bg_palette = displayio.Palette(1)
-        self._bg_palette[0] = Color.colors[self._bg_color]
-        self._bg_sprite = displayio.TileGrid(
-            self._bg_bitmap, pixel_shader=self._bg_palette, x=0, y=0
-        )
-        self._bg_group = displayio.Group(scale=self._bgscale)
-        self._bg_group.append(self._bg_sprite)
-        self._splash.append(self._bg_group)
-        # group to add background pictures (and/or user-defined stuff)
-        self._bg_addon_group = displayio.Group()
-        self._splash.append(self._bg_addon_group)
+        # the background (a black screen needs none) and the addon groups
+        # are only made once they are used
+        self._bg_group = None
+        self._bg_palette = None
+        self._bg_addon = None
+        self._fg_addon = None
         self._fg_scale: int = int(scale)
         self._w //= self._fg_scale
         self._h //= self._fg_scale
-        self._fg_bitmap = displayio.Bitmap(self._w, self._h, len(Color.colors))
+        # the part of the canvas on the display, and where it starts
+        self._view_w = self._w
+        self._view_h = self._h
+        self._view_x = 0
+        self._view_y = 0
 
-        self._fg_palette = displayio.Palette(len(Color.colors))
+        self._fg_palette = displayio.Palette(len(self._colors))
         self._fg_palette.make_transparent(self._bg_color)
-        for i, c in enumerate(Color.colors):
+        for i, c in enumerate(self._colors):
             self._fg_palette[i] = c
-        self._fg_sprite = displayio.TileGrid(
-            self._fg_bitmap, pixel_shader=self._fg_palette, x=0, y=0
-        )
+        if canvas_size is None:
+            self._fg_bitmap = displayio.Bitmap(self._w, self._h, len(self._colors))
+            self._fg_sprite = displayio.TileGrid(
+                self._fg_bitmap, pixel_shader=self._fg_palette, x=0, y=0
+            )
+        else:
+            self._w, self._h = canvas_size
+            self._x = self._w // 2
+            self._y = self._h // 2
+            self._fg_bitmap = TiledCanvas(
+                self._w,
+                self._h,
+                self._view_w,
+                self._view_h,
+                self._fg_palette,
+                value_count=len(self._colors),
+            )
+            self._fg_sprite = self._fg_bitmap.tilegrid
+            self._view_x = (self._w - self._view_w) // 2
+            self._view_y = (self._h - self._view_h) // 2
+            self._fg_bitmap.scroll(self._view_x, self._view_y)
+        # where strokes are written; swapped for a recorder while journaling undo
+        self._canvas = self._fg_bitmap
+        # what _canvas is when not journaling
+        self._writer = self._fg_bitmap
+        # see skipunchanged()
+        self._skip_unchanged = False
         self._fg_group = displayio.Group(scale=self._fg_scale)
         self._fg_group.append(self._fg_sprite)
         self._splash.append(self._fg_group)
-        # group to add text and/or user defined stuff
-        self._fg_addon_group = displayio.Group()
-        self._splash.append(self._fg_addon_group)
 
         self._turtle_bitmap = displayio.Bitmap(9, 9, 2)
         self._turtle_palette = displayio.Palette(2)
@@ -302,34 +643,163 @@ class turtle:
         self._penstate = False
         self._pensize = 1
         self._pencolor = 1
-        self.pencolor(Color.WHITE)
+        self._set_pencolor(self._color_to_pencolor(Color.WHITE))
         self._bg_pic = None
         self._bg_pic_filename = ""
         self._turtle_pic = None
         self._turtle_odb = None
         self._turtle_alt_sprite = None
+        # turned copies of the turtle shape, see rotateturtle()
+        self._shape_buckets = 0
+        self._shape_memory = 0
+        self._shape_cache = {}
+        self._shape_source = None
+        self._shape_tick = 0
+        # the sprite last moved, where to, and when (for animation frames)
+        self._sprite_pose = None
+        self._sprite_time = 0
+        # the frame capture of adafruit_turtle_host, see its start_capture()
+        self._capture = None
         self._turtle_x = self._x
         self._turtle_y = self._y
         self._drawturtle()
         self._stamps = {}
-        self._turtle_odb_use = 0
         self._turtle_odb_file = None
         self._odb_tilegrid = None
-        gc.collect()
+        # opened image files, by path: [bitmap, pixel shader, users, last used]
+        self._images = {}
+        self._image_tick = 0
+        self._image_cache_size = 8
+        self._image_promote = 0
+        # queued drawing commands, see flush()
+        self._render_queue = None
+        self._undobuffer = None
+        self._undo_size = 0
+        # the most bytes of pixels to keep, and how many are kept
+        self._undo_memory = 0
+        self._undo_bytes = 0
+        self._undo_nesting = 0
+        self._undo_state = None
+        self._state_stack = []
+        # see receive()
+        self._received = [0, 0, 0]
+        # what receive() read past an end() command, to be carried out next
+        self._receive_rest = b""
+        self._segments = None
+        self._segment_size = 0
+        self._segment_tick = 0
+        # see fixedpoint(): the sine table, position in 1/256 pixels, direction
+        self._sines = None
+        self._fixed_x = None
+        self._fixed_y = None
+        self._fx = 0
+        self._fy = 0
+        self._fixed_heading = None
+        self._fixed_sin = 0
+        self._fixed_cos = 0
+        # see adafruit_turtle_host.turtle.spatialindex()
+        self._index = None
+        # rendered glyphs, keyed by (font, code point, color), least recently used first out
+        self._glyphs = {}
+        self._glyph_tick = 0
         self._display.root_group = self._splash
 
     # pylint:enable=too-many-statements
 
+    def _background(self) -> None:
+        """Make the background layer, at the bottom of the display"""
+        if self._bg_group is not None:
+            return
+        width = self._display.width
+        height = self._display.height
+        if width == height:
+            # the smallest square bitmap that needs a group scale under 128
+            self._bgscale = width // (width // 128 + 1)
+        else:
+            self._bgscale = self._GCD(width, height)
+        self._bg_bitmap = displayio.Bitmap(width // self._bgscale, height // self._bgscale, 1)
+        self._bg_palette = displayio.Palette(1)
+        self._bg_palette[0] = self._colors[self._bg_color]
+        self._bg_sprite = displayio.TileGrid(
+            self._bg_bitmap, pixel_shader=self._bg_palette, x=0, y=0
+        )
+        self._bg_group = displayio.Group(scale=self._bgscale)
+        self._bg_group.append(self._bg_sprite)
+        self._splash.insert(0, self._bg_group)
+
+    @property
+    def _bg_addon_group(self) -> displayio.Group:
+        """Group to add background pictures (and/or user-defined stuff)"""
+        if self._bg_addon is None:
+            self._bg_addon = displayio.Group()
+            self._splash.insert(self._splash.index(self._fg_group), self._bg_addon)
+        return self._bg_addon
+
+    @property
+    def _fg_addon_group(self) -> displayio.Group:
+        """Group to add text and/or user defined stuff"""
+        if self._fg_addon is None:
+            self._fg_addon = displayio.Group()
+            self._splash.insert(self._splash.index(self._fg_group) + 1, self._fg_addon)
+        return self._fg_addon
+
+    @staticmethod
+    def _fit_canvas(
+        width: int, height: int, bit_depth: int, memory: Optional[int], headroom: int
+    ) -> Tuple[int, int]:
+        """Find the smallest scale, then the deepest bit depth up to bit_depth,
+        whose canvas bitmap fits in memory less headroom"""
+        if memory is None:
+            gc.collect()
+            try:
+                memory = gc.mem_free()
+            except AttributeError:
+                # no way to tell (CPython): the full size canvas will do
+                return 1, bit_depth
+        budget = memory - headroom
+        for scale in range(1, max(width, height) + 1):
+            w = width // scale
+            h = height // scale
+            for depth in (4, 2, 1):
+                # bitmap rows are padded to 32 bit words
+                if depth <= bit_depth and (w * depth + 31) // 32 * 4 * h <= budget:
+                    return scale, depth
+        raise MemoryError("Not enough memory for a turtle canvas")
+
     def _drawturtle(self) -> None:
+        if self._capture is not None:
+            self._capture_frame()
+        if not self._turtle_group:
+            # hidden; showturtle() puts it in place
+            return
+        x = self._turtle_x - self._view_x
+        y = self._turtle_y - self._view_y
         if self._turtle_pic is None:
-            self._turtle_sprite.x = int(self._turtle_x - 4)
-            self._turtle_sprite.y = int(self._turtle_y - 4)
+            sprite = self._turtle_sprite
+            x = int(x - 4)
+            y = int(y - 4)
         elif self._turtle_odb is not None:
-            self._turtle_alt_sprite.x = int(self._turtle_x - self._turtle_odb.width // 2)
-            self._turtle_alt_sprite.y = int(self._turtle_y - self._turtle_odb.height // 2)
+            sprite = self._turtle_alt_sprite
+            x = int(x - self._turtle_odb.width // 2)
+            y = int(y - self._turtle_odb.height // 2)
         else:
-            self._turtle_alt_sprite.x = int(self._turtle_x - self._turtle_pic[0] // 2)
-            self._turtle_alt_sprite.y = int(self._turtle_y - self._turtle_pic[1] // 2)
+            sprite = self._turtle_alt_sprite
+            x = int(x - self._turtle_pic[0] // 2)
+            y = int(y - self._turtle_pic[1] // 2)
+        if self._shape_buckets:
+            turned = self._turned_shape()
+            if turned is not None:
+                sprite = turned[0]
+                x = int(self._turtle_x - self._view_x - turned[1] // 2)
+                y = int(self._turtle_y - self._view_y - turned[1] // 2)
+            if self._turtle_group[0] is not sprite:
+                self._turtle_group[0] = sprite
+        # moving a sprite makes the display redraw where it was and where it is
+        if self._sprite_pose == (sprite, x, y):
+            return
+        self._sprite_pose = (sprite, x, y)
+        sprite.x = x
+        sprite.y = y
 
     ###########################################################################
     # Move and draw
@@ -339,6 +809,9 @@ class turtle:
 
         :param distance: how far to move (integer or float)
         """
+        if self._sines is not None:
+            self._fixed_forward(distance)
+            return
         p = self.pos()
         angle = (self._angleOffset + self._angleOrient * self._heading) % self._fullcircle
         x1 = p[0] + math.sin(math.radians(angle)) * distance
@@ -403,17 +876,43 @@ class turtle:
         xn: float = x1[0] if y1 is None else x1  # type: ignore
         xn += self._w // 2
         yn = self._h // 2 - yn
-        if not self.isdown():
-            self._x = xn  # woot, we just skip ahead
+        self._undo_begin()
+        try:
+            if not self.isdown():
+                self._x = xn  # woot, we just skip ahead
+                self._y = yn
+                self._drawturtle()
+                return
+
+            self._do_draw_line(round(self._x), round(self._y), round(xn), round(yn))
+            self._x = xn
             self._y = yn
-            self._drawturtle()
-            return
+        finally:
+            self._undo_end()
 
-        self._do_draw_line(round(self._x), round(self._y), round(xn), round(yn))
-        self._x = xn
-        self._y = yn
+    # the shortest time between sprite moves while animating a line
+    _FRAME_MS = 16
 
     def _do_draw_line(self, x0: int, y0: int, xn: int, yn: int):
+        if self._segments is not None and self._segment_drawn(x0, y0, xn, yn):
+            # every pixel of it is still there
+            self._turtle_x = xn
+            self._turtle_y = yn
+            self._drawturtle()
+            return
+        if self._index is not None:
+            self._index.add((x0, y0, xn, yn, self._pensize / 2))
+        if self._speed == 0 or self._render_queue is not None:
+            # no animation: hand the whole segment to the rasterizer at once
+            args = (x0, y0, xn, yn, self._pencolor) + self._pen()
+            if self._render_queue is not None:
+                self._render_queue.put((self._raster_line, args))
+            else:
+                self._raster_line(*args)
+            self._turtle_x = xn
+            self._turtle_y = yn
+            self._drawturtle()
+            return
         steep = abs(yn - y0) > abs(xn - x0)
         rev = False
         dx = xn - x0
@@ -428,7 +927,7 @@ class turtle:
             dx = x0 - xn
 
         dy = abs(yn - y0)
-        err = dx / 2
+        err = dx // 2
         ystep = -1
         if y0 < yn:
             ystep = 1
@@ -455,10 +954,13 @@ class turtle:
                 self._turtle_y = y0
             if self._speed > 0:
                 if step >= self._speed:
-                    # mark the step
+                    # mark the step; the sprite only moves once per frame
                     step = 1
-                    self._drawturtle()
-                    time.sleep(ts)
+                    now = _ticks_ms()
+                    if (now - self._sprite_time) & _TICKS_MASK >= self._FRAME_MS:
+                        self._sprite_time = now
+                        self._drawturtle()
+                    self._sleep(ts)
                 else:
                     step += 1
             err -= dy
@@ -522,22 +1024,90 @@ class turtle:
         self.setheading(90)
         self.goto(0, 0)
 
-    # pylint:disable=too-many-locals, too-many-statements, too-many-branches
+    def push(self) -> None:
+        """
+        Save the turtle's position, heading, pen state, pen size and pen
+        color on a stack, to go back to them with pop()."""
+        self._state_stack.append(
+            (self._x, self._y, self._heading, self._penstate, self._pensize, self._pencolor)
+        )
+
+    def pop(self) -> None:
+        """
+        Go back to the position, heading and pen last saved with push().
+        The turtle jumps there without drawing, turning or animating."""
+        if not self._state_stack:
+            raise IndexError("pop() without a matching push()")
+        self._undo_begin()
+        try:
+            (x, y, self._heading, self._penstate, self._pensize, pencolor) = self._state_stack.pop()
+            self._set_pencolor(pencolor)
+            self._x = self._turtle_x = x
+            self._y = self._turtle_y = y
+            self._drawturtle()
+        finally:
+            self._undo_end()
+
+    def _pen(self) -> Tuple[int, float, bool]:
+        """Capture the pen geometry (size, nib angle, slanted) used by _plot_pen"""
+        angle = (self._angleOffset + self._angleOrient * self._heading - 90) % self._fullcircle
+        return (self._pensize, angle, self._heading % 90 != 0)
+
     def _plot(self, x: float, y: float, c: int) -> None:
+        if self._render_queue is not None:
+            self._render_queue.put((self._plot_pen, (x, y, c) + self._pen()))
+            return
         if self._pensize == 1:
             try:
-                self._fg_bitmap[int(x), int(y)] = c
+                self._canvas[int(x), int(y)] = c
                 return
             except IndexError:
                 pass
-        r = self._pensize // 2 + 1
-        angle = (self._angleOffset + self._angleOrient * self._heading - 90) % self._fullcircle
+        self._plot_pen(x, y, c, *self._pen())
+
+    def _raster_line(
+        self, x0: int, y0: int, xn: int, yn: int, c: int, size: int, angle: float, slant: bool
+    ) -> None:
+        """Rasterize a whole segment with a fixed pen and no animation"""
+        steep = abs(yn - y0) > abs(xn - x0)
+        if steep:
+            x0, y0 = y0, x0
+            xn, yn = yn, xn
+        rev = x0 > xn
+        dx = x0 - xn if rev else xn - x0
+        dy = abs(yn - y0)
+        err = dx // 2
+        ystep = 1 if y0 < yn else -1
+        xstep = -1 if rev else 1
+        plot = self._plot_pen
+        for _ in range(dx + 1):
+            if steep:
+                plot(y0, x0, c, size, angle, slant)
+            else:
+                plot(x0, y0, c, size, angle, slant)
+            err -= dy
+            if err < 0:
+                y0 += ystep
+                err += dx
+            x0 += xstep
+
+    # pylint:disable=too-many-locals, too-many-statements, too-many-branches
+    def _plot_pen(self, x: float, y: float, c: int, size: int, angle: float, slant: bool) -> None:
+        canvas = self._canvas
+        skip = self._skip_unchanged
+        if size == 1:
+            try:
+                canvas[int(x), int(y)] = c
+                return
+            except IndexError:
+                pass
+        r = size // 2 + 1
         sin = math.sin(math.radians(angle))
         cos = math.cos(math.radians(angle))
         x0 = x + sin * r
-        x1 = x - sin * (self._pensize - r)
+        x1 = x - sin * (size - r)
         y0 = y - cos * r
-        y1 = y + cos * (self._pensize - r)
+        y1 = y + cos * (size - r)
 
         coords = [x0, x1, y0, y1]
         for i, v in enumerate(coords):
@@ -560,7 +1130,7 @@ class turtle:
             dx = x0 - x1
 
         dy = abs(y1 - y0)
-        err = dx / 2
+        err = dx // 2
         ystep = -1
         if y0 < y1:
             ystep = 1
@@ -569,25 +1139,25 @@ class turtle:
             # first row
             if steep:
                 try:
-                    self._fg_bitmap[int(y0), int(x0)] = c
+                    canvas[int(y0), int(x0)] = c
                 except IndexError:
                     pass
             else:
                 try:
-                    self._fg_bitmap[int(x0), int(y0)] = c
+                    canvas[int(x0), int(y0)] = c
                 except IndexError:
                     pass
-            if y0 != y1 and self._heading % 90 != 0:
+            if y0 != y1 and slant:
                 # need a second row to fill the cracks
                 j = -1 if y1 < y0 else 1
                 if steep:
-                    try:
-                        self._fg_bitmap[int(y0 + j), int(x0)] = c
-                    except IndexError:
-                        pass
+                    px, py = int(y0 + j), int(x0)
                 else:
+                    px, py = int(x0), int(y0 + j)
+                # mostly filled already by the step before, see skipunchanged()
+                if not (skip and 0 <= px < self._w and 0 <= py < self._h and canvas[px, py] == c):
                     try:
-                        self._fg_bitmap[int(x0), int(y0 + j)] = c
+                        canvas[px, py] = c
                     except IndexError:
                         pass
             err -= dy
@@ -624,36 +1194,40 @@ class turtle:
         # --or: circle(radius, extent)          # arc
         # --or: circle(radius, extent, steps)
         # --or: circle(radius, steps=6)         # 6-sided polygon
-        change_back = False
-        if not self._in_degrees():
-            change_back = True
-            original_mode = "standard" if not self._logomode else "logo"
-            self.degrees()
-            self.mode("standard")
-        pos = self.pos()
-        h = self._heading
-        if extent is None:
-            extent = self._fullcircle
-        if steps is None:
-            frac = abs(extent) / self._fullcircle
-            steps = int(min(3 + abs(radius) / 4.0, 12.0) * frac) * 4
-        w = extent / steps
-        w2 = 0.5 * w
-        l = radius * math.sin(w * math.pi / 180.0 * self._degreesPerAU)
-        if radius < 0:
-            l, w, w2 = -l, -w, -w2
-        self.left(w2)
-        for _ in range(steps - 1):
-            self.forward(l)
-            self.left(w)
-        # rounding error correction on the last step
-        self.setheading(self.towards(pos))
-        # get back to exact same position and heading
-        self.goto(pos)
-        self.setheading(h)
-        if change_back:
-            self.radians()
-            self.mode(original_mode)
+        self._undo_begin()
+        try:
+            change_back = False
+            if not self._in_degrees():
+                change_back = True
+                original_mode = "standard" if not self._logomode else "logo"
+                self.degrees()
+                self.mode("standard")
+            pos = self.pos()
+            h = self._heading
+            if extent is None:
+                extent = self._fullcircle
+            if steps is None:
+                frac = abs(extent) / self._fullcircle
+                steps = int(min(3 + abs(radius) / 4.0, 12.0) * frac) * 4
+            w = extent / steps
+            w2 = 0.5 * w
+            l = radius * math.sin(w * math.pi / 180.0 * self._degreesPerAU)
+            if radius < 0:
+                l, w, w2 = -l, -w, -w2
+            self.left(w2)
+            for _ in range(steps - 1):
+                self.forward(l)
+                self.left(w)
+            # rounding error correction on the last step
+            self.setheading(self.towards(pos))
+            # get back to exact same position and heading
+            self.goto(pos)
+            self.setheading(h)
+            if change_back:
+                self.radians()
+                self.mode(original_mode)
+        finally:
+            self._undo_end()
 
     # pylint:disable=inconsistent-return-statements
     def speed(self, speed: Optional[int] = None) -> Optional[int]:
@@ -697,39 +1271,49 @@ class turtle:
         :param color: the color of the dot
 
         """
-        change_back = False
-        if not self._in_degrees():
-            change_back = True
-            original_mode = "standard" if not self._logomode else "logo"
-            print(f"old mode: {original_mode}")
-            self.degrees()
-            self.mode("standard")
-        if size is None:
-            size = max(self._pensize + 4, self._pensize * 2)
-        if color is None:
-            color = self._pencolor
-        else:
-            color = self._color_to_pencolor(color)
-        pensize = self._pensize
-        pencolor = self._pencolor
-        down = self.isdown()
-        if size > 1:
-            self._pensize = size
-            self._pencolor = color
-            self.pendown()
-            self.right(180)
-            self.right(180)
-            if not down:
-                self.penup()
-            self._pensize = pensize
-            self._pencolor = pencolor
-        else:
-            self._pensize = 1
-            self._plot(self._x, self._y, color)
-            self._pensize = pensize
-        if change_back:
-            self.radians()
-            self.mode(original_mode)
+        self._undo_begin()
+        try:
+            change_back = False
+            if not self._in_degrees():
+                change_back = True
+                original_mode = "standard" if not self._logomode else "logo"
+                print(f"old mode: {original_mode}")
+                self.degrees()
+                self.mode("standard")
+            if size is None:
+                size = max(self._pensize + 4, self._pensize * 2)
+            if color is None:
+                color = self._pencolor
+            else:
+                color = self._color_to_pencolor(color)
+                if color != self._pencolor:
+                    self._forget_segments()
+            pensize = self._pensize
+            pencolor = self._pencolor
+            down = self.isdown()
+            if size > 1:
+                self._pensize = size
+                self._pencolor = color
+                self.pendown()
+                self.right(180)
+                self.right(180)
+                if not down:
+                    self.penup()
+                self._pensize = pensize
+                self._pencolor = pencolor
+            else:
+                self._pensize = 1
+                self._plot(self._x, self._y, color)
+                self._pensize = pensize
+            if self._index is not None:
+                x = round(self._x)
+                y = round(self._y)
+                self._index.add((x, y, x, y, size / 2))
+            if change_back:
+                self.radians()
+                self.mode(original_mode)
+        finally:
+            self._undo_end()
 
     def stamp(
         self,
@@ -747,18 +1331,18 @@ class turtle:
             new_stamp = displayio.TileGrid(
                 self._turtle_bitmap,
                 pixel_shader=self._turtle_palette,
-                x=int(self._x - self._turtle_bitmap.width // 2),
-                y=int(self._y - self._turtle_bitmap.height // 2),
+                x=int(self._x - self._view_x - self._turtle_bitmap.width // 2),
+                y=int(self._y - self._view_y - self._turtle_bitmap.height // 2),
             )
         elif self._turtle_odb is not None:
-            # odb bitmap
+            # image file, shared with the turtle shape
+            image, shader = self._open_image(self._turtle_odb_file)
             new_stamp = displayio.TileGrid(
-                self._turtle_odb,
-                pixel_shader=self._turtle_odb.pixel_shader,
-                x=int(self._x - self._turtle_odb.width // 2),
-                y=int(self._y - self._turtle_odb.height // 2),
+                image,
+                pixel_shader=shader,
+                x=int(self._x - self._view_x - image.width // 2),
+                y=int(self._y - self._view_y - image.height // 2),
             )
-            self._turtle_odb_use += 1
         else:
             if bitmap is None:
                 raise RuntimeError("a bitmap must be provided")
@@ -767,8 +1351,8 @@ class turtle:
             new_stamp = displayio.TileGrid(
                 bitmap,
                 pixel_shader=palette,
-                x=int(self._x - bitmap.width // 2),
-                y=int(self._y - bitmap.height // 2),
+                x=int(self._x - self._view_x - bitmap.width // 2),
+                y=int(self._y - self._view_y - bitmap.height // 2),
             )
         self._fg_addon_group.append(new_stamp)
         if self._turtle_odb is not None:
@@ -790,7 +1374,7 @@ class turtle:
             if stampid in self._stamps and self._stamps[stampid] is not None:
                 if isinstance(self._stamps[stampid], tuple):
                     self._fg_addon_group.remove(self._stamps[stampid][0])
-                    self._turtle_odb_use -= 1
+                    self._release_image(self._stamps[stampid][1])
 
                 else:
                     self._fg_addon_group.remove(self._stamps[stampid])
@@ -817,6 +1401,281 @@ class turtle:
                     return
                 i += 1
 
+    ###########################################################################
+    # Batch drawing
+
+    def path(self, points) -> None:
+        """
+        Move the turtle through a series of points, drawing a connected line
+        if the pen is down. This draws the same as calling goto() for every
+        point, but the turtle is only updated once, at the end, and the line
+        is drawn without animation.
+
+        :param points: any iterable of (x, y) pairs or Vec2D, or a flat
+         sequence of numbers x0, y0, x1, y1, ... such as an array("f")
+
+        """
+        cx = self._w // 2
+        cy = self._h // 2
+        down = self.isdown()
+        raster = self._raster_line
+        queue = self._render_queue
+        pen = (self._pencolor,) + self._pen()
+        index = self._index
+        xn, yn = self._x, self._y
+        x0, y0 = round(xn), round(yn)
+        self._undo_begin()
+        try:
+            it = iter(points)
+            for p in it:
+                if isinstance(p, (int, float)):
+                    xn = p + cx
+                    yn = cy - next(it)
+                else:
+                    xn = p[0] + cx
+                    yn = cy - p[1]
+                if down:
+                    x1, y1 = round(xn), round(yn)
+                    if self._segments is None or not self._segment_drawn(x0, y0, x1, y1):
+                        if index is not None:
+                            index.add((x0, y0, x1, y1, pen[1] / 2))
+                        if queue is None:
+                            raster(x0, y0, x1, y1, *pen)
+                        else:
+                            queue.put((raster, (x0, y0, x1, y1) + pen))
+                    x0, y0 = x1, y1
+            self._x = xn
+            self._y = yn
+            self._turtle_x = x0 if down else xn
+            self._turtle_y = y0 if down else yn
+            self._drawturtle()
+        finally:
+            self._undo_end()
+
+    goto_many = path
+
+    def draw_segments(
+        self,
+        segments,
+        color: Optional[Union[int, List[int]]] = None,
+        width: Optional[Union[int, List[int]]] = None,
+    ) -> None:
+        """
+        Draw many separate line segments in one call, without moving the
+        turtle. Each segment is drawn exactly as goto() would draw it with
+        the pen down and the current heading.
+
+        The turtle of `adafruit_turtle_host` rasterizes all the segments
+        together with NumPy, when it is available.
+
+        :param segments: (x0, y0, x1, y1) endpoints, as a sequence, an
+         iterable or an array of shape (n, 4)
+        :param color: the pen color, or one color per segment (default: the
+         current pencolor)
+        :param width: the pen size, or one size per segment (default: the
+         current pensize)
+
+        """
+        if not hasattr(segments, "__len__"):
+            # a generator, which the spatial index and drawing both go through
+            segments = list(segments)
+        if color is None:
+            color = self._colors[self._pencolor]
+        if isinstance(color, int):
+            color = self._color_to_pencolor(color)
+        else:
+            color = [self._color_to_pencolor(int(c)) for c in color]
+        if color != self._pencolor:
+            self._forget_segments()
+        if width is None:
+            width = self._pensize
+        _, angle, slant = self._pen()
+        self._undo_begin()
+        try:
+            self.flush()
+            if self._index is not None:
+                cx = self._w // 2
+                cy = self._h // 2
+                for i, (x0, y0, x1, y1) in enumerate(segments):
+                    size = width if isinstance(width, int) else int(width[i])
+                    self._index.add(
+                        (round(x0 + cx), round(cy - y0), round(x1 + cx), round(cy - y1), size / 2)
+                    )
+            self._draw_segments(segments, color, width, angle, slant)
+        finally:
+            self._undo_end()
+
+    def _draw_segments(self, segments, color, width, angle, slant) -> None:
+        """Rasterize the segments of draw_segments() one at a time"""
+        cx = self._w // 2
+        cy = self._h // 2
+        for i, (x0, y0, x1, y1) in enumerate(segments):
+            self._raster_line(
+                round(x0 + cx),
+                round(cy - y0),
+                round(x1 + cx),
+                round(cy - y1),
+                color if isinstance(color, int) else color[i],
+                width if isinstance(width, int) else int(width[i]),
+                angle,
+                slant,
+            )
+
+    def _fill_row(self, x: int, y: int, count: int, value: int) -> None:
+        """Set count pixels of canvas row y, starting at x, to value"""
+        self._touched(x, y, x + count - 1, y)
+        if not self._skip_unchanged:
+            self._fill_span(x, y, count, value)
+            return
+        # fill only the spans of pixels that do not have the value yet
+        bitmap = self._fg_bitmap
+        end = x + count
+        while x < end:
+            while x < end and bitmap[x, y] == value:
+                x += 1
+            start = x
+            while x < end and bitmap[x, y] != value:
+                x += 1
+            if x > start:
+                self._fill_span(start, y, x - start, value)
+
+    def _fill_span(self, x: int, y: int, count: int, value: int) -> None:
+        bitmap = self._fg_bitmap
+        if isinstance(bitmap, displayio.Bitmap):
+            import bitmaptools
+
+            bitmaptools.fill_region(bitmap, x, y, x + count, y + 1, value)
+        else:
+            for i in range(x, x + count):
+                bitmap[i, y] = value
+
+    def segmentcache(self, size: Optional[int] = 256) -> None:
+        """
+        Remember the last size line segments drawn, and skip drawing one again
+        while its pixels are all still there: the turtle just moves along it.
+        Drawings that retrace the same lines over and over get much faster.
+        A segment only counts as the same with the same ends, pen color, pen
+        size and, for thick pens, heading. Segments are forgotten whenever
+        something is drawn in another color, which could cover them.
+
+        :param size: how many segments to remember, or None to stop
+
+        """
+        if size is None or size < 1:
+            self._segments = None
+            return
+        self._segments = {}
+        self._segment_size = size
+
+    def skipunchanged(self, skip: bool = True) -> None:
+        """
+        Leave alone pixels that already have the value where that is
+        likely: the extra row a thick slanted pen writes to fill cracks,
+        which the step before mostly filled, and the row runs of fills,
+        restores and undo, of which only the spans that change are filled.
+        Every write makes the display refresh that area, so this mostly
+        saves refresh; reading a pixel costs about as much as writing it.
+
+        :param skip: True to skip unchanged pixels, False to write them all
+
+        """
+        self.flush()
+        self._skip_unchanged = skip
+
+    def _wrap_writer(self, writer):
+        """The canvas writer to draw through instead of writer; frame capture
+        wraps it to see what changes"""
+        return writer
+
+    def _segment_drawn(self, x0: int, y0: int, xn: int, yn: int) -> bool:
+        """Whether this segment, in the current pen, is remembered; it is from now on"""
+        segments = self._segments
+        key = (x0, y0, xn, yn, self._pencolor) + self._pen()
+        self._segment_tick += 1
+        if key in segments:
+            segments[key] = self._segment_tick
+            return True
+        if len(segments) >= self._segment_size:
+            # forget the least recently drawn half at once
+            ticks = sorted(segments.values())
+            cut = ticks[(len(ticks) - 1) // 2]
+            for old in [k for k, tick in segments.items() if tick <= cut]:
+                del segments[old]
+        segments[key] = self._segment_tick
+        return False
+
+    def _forget_segments(self) -> None:
+        if self._segments:
+            self._segments = {}
+
+    def fixedpoint(self, enable: bool = True) -> None:
+        """
+        Move forward() and backward() in integer arithmetic: the position is
+        kept in 1/256 pixel steps and the direction is looked up in a table of
+        1024 headings. On boards without floating point hardware, such as the
+        SAMD21, these moves get several times faster. Headings are rounded to
+        the nearest table entry (about a third of a degree), so a long line can
+        end a pixel or so away from where floating point puts it, but the same
+        commands always draw the same pixels. Whole number distances are the
+        fastest.
+
+        :param enable: True for fixed point, False for floating point
+
+        """
+        if not enable:
+            self._sines = None
+            return
+        # a quarter of a sine wave, scaled to 1 << 14
+        self._sines = array.array(
+            "h", (round(math.sin(i * math.pi / 512) * 16384) for i in range(257))
+        )
+        self._fixed_x = None
+        self._fixed_heading = None
+
+    def _sine(self, step: int) -> int:
+        """The sine of step 1024ths of a full turn, times 1 << 14"""
+        step &= 1023
+        if step > 512:
+            return -self._sines[min(step - 512, 1024 - step)]
+        return self._sines[min(step, 512 - step)]
+
+    def _fixed_forward(self, distance: float) -> None:
+        if self._heading is not self._fixed_heading:
+            angle = (self._angleOffset + self._angleOrient * self._heading) % self._fullcircle
+            # in degrees, the way forward() takes it
+            step = int(angle * 1024 / 360 + 0.5)
+            self._fixed_sin = self._sine(step)
+            self._fixed_cos = self._sine(step + 256)
+            self._fixed_heading = self._heading
+        if self._x is not self._fixed_x or self._y is not self._fixed_y:
+            # moved some other way since
+            self._fx = round(self._x * 256)
+            self._fy = round(self._y * 256)
+        x0 = self._fx
+        y0 = self._fy
+        if isinstance(distance, int):
+            xn = x0 + (distance * self._fixed_sin >> 6)
+            yn = y0 - (distance * self._fixed_cos >> 6)
+        else:
+            xn = x0 + round(distance * self._fixed_sin / 64)
+            yn = y0 - round(distance * self._fixed_cos / 64)
+        self._fx = xn
+        self._fy = yn
+        self._undo_begin()
+        try:
+            if self.isdown():
+                self._do_draw_line(
+                    (x0 + 128) >> 8, (y0 + 128) >> 8, (xn + 128) >> 8, (yn + 128) >> 8
+                )
+                self._x = self._fixed_x = xn / 256
+                self._y = self._fixed_y = yn / 256
+            else:
+                self._x = self._fixed_x = xn / 256
+                self._y = self._fixed_y = yn / 256
+                self._drawturtle()
+        finally:
+            self._undo_end()
+
     ###########################################################################
     # Tell turtle's state
 
@@ -885,6 +1744,7 @@ class turtle:
         """Helper function for degrees() and radians()"""
         self._fullcircle = fullcircle
         self._degreesPerAU = 360 / fullcircle
+        self._fixed_heading = None
         if self._logomode:
             self._angleOffset = 0
         else:
@@ -919,6 +1779,7 @@ class turtle:
 
         :param mode: one of the strings "standard" or "logo"
         """
+        self._fixed_heading = None
         if mode == "standard":
             self._logomode = False
             self._angleOrient = -1
@@ -935,6 +1796,42 @@ class turtle:
             raise RuntimeError("Mode must be 'logo', 'standard', or None")
         return None
 
+    def viewport(self, x: Optional[float] = None, y: Optional[float] = None) -> Vec2D:
+        """
+        Scroll a canvas that is larger than the display (see canvas_size) so
+        that (x, y) is at the center of the display, and return the point at
+        the center. If no argument is given, only return it. Scrolling only
+        changes which tiles are shown; nothing is redrawn.
+
+        :param x: a number or a pair/vector of numbers
+        :param y: a number if x is a number, else None
+
+        """
+        if x is not None:
+            if y is None:
+                y = x[1]
+                x = x[0]
+            if not isinstance(self._fg_bitmap, TiledCanvas):
+                raise RuntimeError("Only a canvas larger than the display can scroll")
+            view_x = round(x + self._w // 2 - self._view_w // 2)
+            view_y = round(self._h // 2 - y - self._view_h // 2)
+            if self._fg_addon is not None:
+                # keep stamps and labels over the canvas pixels they were put
+                # on; labels are placed in display pixels
+                for item in self._fg_addon:
+                    scale = 1 if isinstance(item, displayio.TileGrid) else self._fg_scale
+                    item.x -= (view_x - self._view_x) * scale
+                    item.y -= (view_y - self._view_y) * scale
+            self._view_x = view_x
+            self._view_y = view_y
+            self._fg_bitmap.scroll(self._view_x, self._view_y)
+            self._touched(0, 0, self._w - 1, self._h - 1)
+            self._drawturtle()
+        return Vec2D(
+            self._view_x + self._view_w // 2 - self._w // 2,
+            self._h // 2 - self._view_y - self._view_h // 2,
+        )
+
     def window_height(self) -> float:
         """
         Return the height of the turtle window."""
@@ -950,14 +1847,18 @@ class turtle:
 
     def pendown(self) -> None:
         """Pull the pen down - drawing when moving."""
+        self._undo_begin()
         self._penstate = True
+        self._undo_end()
 
     pd = pendown
     down = pendown
 
     def penup(self) -> None:
         """Pull the pen up - no drawing when moving."""
+        self._undo_begin()
         self._penstate = False
+        self._undo_end()
 
     pu = penup
     up = penup
@@ -975,7 +1876,9 @@ class turtle:
 
         """
         if width is not None:
+            self._undo_begin()
             self._pensize = width
+            self._undo_end()
         return self._pensize
 
     width = pensize
@@ -983,12 +1886,25 @@ class turtle:
     ###########################################################################
     # Color control
 
-    # pylint:disable=no-self-use
-
-    def _color_to_pencolor(self, c: int) -> int:
-        return Color.colors.index(c)
-
-    # pylint:enable=no-self-use
+    def _color_to_pencolor(self, c: int, background: bool = False) -> int:
+        if c not in Color.colors:
+            raise RuntimeError("Color must be one of the 'Color' class items")
+        if c in self._colors:
+            return self._colors.index(c)
+        # quantise to the nearest color the canvas can hold; unless it is for
+        # the background, never to the background, where it would not show
+        best = 0
+        best_distance = None
+        for i, a in enumerate(self._colors):
+            if i == self._bg_color and not background:
+                continue
+            distance = 0
+            for shift in (16, 8, 0):
+                distance += (((a >> shift) & 0xFF) - ((c >> shift) & 0xFF)) ** 2
+            if best_distance is None or distance < best_distance:
+                best = i
+                best_distance = distance
+        return best
 
     def pencolor(self, c: Optional[int] = None) -> int:
         """
@@ -1007,16 +1923,23 @@ class turtle:
 
         """
         if c is None:
-            return Color.colors[self._pencolor]
-        if c not in Color.colors:
-            raise RuntimeError("Color must be one of the 'Color' class items")
-        self._pencolor = Color.colors.index(c)
+            return self._colors[self._pencolor]
+        pencolor = self._color_to_pencolor(c)
+        self._undo_begin()
+        self._set_pencolor(pencolor)
+        self._undo_end()
+        return self._colors[pencolor]
+
+    def _set_pencolor(self, pencolor: int) -> None:
+        if pencolor != self._pencolor:
+            self._forget_segments()
+        self._pencolor = pencolor
+        c = self._colors[self._pencolor]
         self._turtle_palette[1] = c
         if self._bg_color == self._pencolor:
             self._turtle_palette.make_transparent(1)
         else:
             self._turtle_palette.make_opaque(1)
-        return c
 
     def bgcolor(self, c: Optional[int] = None) -> int:
         """
@@ -1032,24 +1955,36 @@ class turtle:
             WHITE, BLACK, RED, ORANGE, YELLOW, GREEN, BLUE, PURPLE, PINK
         """
         if c is None:
-            return Color.colors[self._bg_color]
-        if c not in Color.colors:
-            raise RuntimeError("Color must be one of the 'Color' class items")
+            return self._colors[self._bg_color]
+        index = self._color_to_pencolor(c, background=True)
+        self.flush()
+        self._undo_reset()
+        self._forget_segments()
+        self._touched(0, 0, self._w - 1, self._h - 1)
         old_color = self._bg_color
-        self._fg_palette.make_opaque(old_color)
-        self._bg_color = Color.colors.index(c)
-        self._bg_palette[0] = c
-        self._fg_palette.make_transparent(self._bg_color)
-        self._turtle_palette[0] = c
-        if self._bg_color == self._pencolor:
-            self._turtle_palette.make_transparent(1)
-        else:
-            self._turtle_palette.make_opaque(1)
+        self._set_bg_color(index)
+        if isinstance(self._fg_bitmap, TiledCanvas):
+            self._fg_bitmap.recolor(old_color, self._bg_color)
+            return self._colors[self._bg_color]
         for h in range(self._h):
             for w in range(self._w):
                 if self._fg_bitmap[w, h] == old_color:
                     self._fg_bitmap[w, h] = self._bg_color
-        return Color.colors[self._bg_color]
+        return self._colors[self._bg_color]
+
+    def _set_bg_color(self, index: int) -> None:
+        """Update the palettes for a new background color index"""
+        self._fg_palette.make_opaque(self._bg_color)
+        self._bg_color = index
+        if self._bg_palette is not None or self._colors[index] != Color.BLACK:
+            self._background()
+            self._bg_palette[0] = self._colors[index]
+        self._fg_palette.make_transparent(index)
+        self._turtle_palette[0] = self._colors[index]
+        if self._bg_color == self._pencolor:
+            self._turtle_palette.make_transparent(1)
+        else:
+            self._turtle_palette.make_opaque(1)
 
     # pylint:disable=inconsistent-return-statements
     def bgpic(self, picname: Optional[str] = None) -> Optional[str]:
@@ -1065,21 +2000,25 @@ class turtle:
         if picname == "nopic":
             if self._bg_pic is not None:
                 self._bg_addon_group.remove(self._odb_tilegrid)
+                self._release_image(self._bg_pic)
                 self._odb_tilegrid = None
                 self._bg_pic = None
                 self._bg_pic_filename = ""
         else:
-            odb = displayio.OnDiskBitmap(picname)
-
+            odb, shader = self._open_image(picname)
+            if self._bg_pic is not None:
+                self._bg_addon_group.remove(self._odb_tilegrid)
+                self._release_image(self._bg_pic)
             self._odb_tilegrid = displayio.TileGrid(
                 odb,
-                pixel_shader=odb.pixel_shader,
+                pixel_shader=shader,
             )
             self._bg_addon_group.append(self._odb_tilegrid)
+            self._bg_pic = picname
             self._bg_pic_filename = picname
             # centered
-            self._odb_tilegrid.y = ((self._h * self._fg_scale) // 2) - (odb.height // 2)
-            self._odb_tilegrid.x = ((self._w * self._fg_scale) // 2) - (odb.width // 2)
+            self._odb_tilegrid.y = ((self._view_h * self._fg_scale) // 2) - (odb.height // 2)
+            self._odb_tilegrid.x = ((self._view_w * self._fg_scale) // 2) - (odb.width // 2)
         return None
 
     # pylint:enable=inconsistent-return-statements
@@ -1100,19 +2039,700 @@ class turtle:
         self.setheading(0)
         self.pensize(1)
         self.pencolor(Color.WHITE)
+        self._undo_reset()
 
     def clear(self) -> None:
         """Delete the turtle's drawings from the screen. Do not move turtle."""
         self.clearstamps()
-        for w in range(self._w):
-            for h in range(self._h):
-                self._fg_bitmap[w, h] = self._bg_color
-        for i, c in enumerate(Color.colors):
+        self.flush()
+        self._undo_reset()
+        self._forget_segments()
+        if self._index is not None:
+            self._index.clear()
+        self._touched(0, 0, self._w - 1, self._h - 1)
+        self._fg_bitmap.fill(self._bg_color)
+        for i, c in enumerate(self._colors):
             self._fg_palette[i] = c ^ 0xFFFFFF
-        for i, c in enumerate(Color.colors):
+        for i, c in enumerate(self._colors):
             self._fg_palette[i] = c
         time.sleep(0.1)
 
+    _GLYPH_CACHE_SIZE = 96
+
+    def write(
+        self,
+        arg: object,
+        move: bool = False,
+        align: str = "left",
+        font=None,
+        label: bool = False,
+    ):
+        """
+        Write text at the current turtle position, with its baseline at the
+        turtle. Glyphs are rendered once per font and color and kept in a
+        small cache, so writing the same text again only copies pixels.
+
+        :param arg: what to write; it is converted to a string
+        :param move: if True, move the turtle to the end of the text
+        :param align: "left", "center" or "right" of the turtle position
+        :param font: a font from ``adafruit_bitmap_font`` (default: ``terminalio.FONT``)
+        :param label: if True, show the text as an ``adafruit_display_text``
+         label above the canvas instead of drawing it; the label is returned
+         so it can be changed or removed later
+
+        """
+        if align not in {"left", "center", "right"}:
+            raise ValueError("align must be 'left', 'center' or 'right'")
+        if font is None:
+            try:
+                import terminalio
+            except ImportError as err:
+                raise RuntimeError("No built in font available. One must be provided.") from err
+            font = terminalio.FONT
+        text = str(arg)
+        advance = 0
+        for ch in text:
+            glyph = font.get_glyph(ord(ch))
+            if glyph is not None:
+                advance += glyph.shift_x
+        x = int(self._x)
+        y = int(self._y)
+        if align == "center":
+            x -= advance // 2
+        elif align == "right":
+            x -= advance
+        written = None
+        if label:
+            from adafruit_display_text.label import Label
+
+            written = Label(
+                font,
+                text=text,
+                color=self._colors[self._pencolor],
+                scale=self._fg_scale,
+                anchor_point=(0, 1),
+                anchored_position=(
+                    (x - self._view_x) * self._fg_scale,
+                    (y - self._view_y) * self._fg_scale,
+                ),
+            )
+            self._fg_addon_group.append(written)
+        else:
+            self._undo_begin()
+            try:
+                self.flush()
+                pen_x = x
+                for ch in text:
+                    pen_x += self._blit_glyph(font, ord(ch), pen_x, y)
+            finally:
+                self._undo_end()
+        if move:
+            self._x = x + advance
+            self._turtle_x = self._x
+            self._drawturtle()
+        return written
+
+    def _glyph(self, font, code: int) -> Optional[tuple]:
+        """The (bitmap, x, y, advance) of a glyph in the pen color, from the cache
+        if possible; pixels of the bitmap that are not the pen color are blank"""
+        key = (font, code, self._pencolor)
+        self._glyph_tick += 1
+        cached = self._glyphs.get(key)
+        if cached is not None:
+            cached[1] = self._glyph_tick
+            return cached[0]
+        glyph = font.get_glyph(code)
+        if glyph is None:
+            return None
+        color = self._pencolor
+        blank = color ^ 1
+        bitmap = None
+        if glyph.width and glyph.height:
+            source = glyph.bitmap
+            left = glyph.tile_index * glyph.width
+            bitmap = displayio.Bitmap(glyph.width, glyph.height, len(self._colors))
+            bitmap.fill(blank)
+            for j in range(glyph.height):
+                for i in range(glyph.width):
+                    if source[left + i, j]:
+                        bitmap[i, j] = color
+        entry = (bitmap, glyph.dx, -glyph.dy - glyph.height, glyph.shift_x)
+        if len(self._glyphs) >= self._GLYPH_CACHE_SIZE:
+            oldest = min(self._glyphs, key=lambda k: self._glyphs[k][1])
+            del self._glyphs[oldest]
+        self._glyphs[key] = [entry, self._glyph_tick]
+        return entry
+
+    def _blit_glyph(self, font, code: int, x: int, y: int) -> int:
+        """Draw a glyph with its origin at canvas x, y and return its advance"""
+        entry = self._glyph(font, code)
+        if entry is None:
+            return 0
+        bitmap, dx, dy, advance = entry
+        if bitmap is None:
+            return advance
+        x += dx
+        y += dy
+        # the part of the glyph that is on the canvas
+        x1 = max(0, -x)
+        y1 = max(0, -y)
+        x2 = min(bitmap.width, self._w - x)
+        y2 = min(bitmap.height, self._h - y)
+        if x1 >= x2 or y1 >= y2:
+            return advance
+        color = self._pencolor
+        canvas = self._canvas
+        if isinstance(canvas, displayio.Bitmap):
+            import bitmaptools
+
+            bitmaptools.blit(
+                canvas,
+                bitmap,
+                x + x1,
+                y + y1,
+                x1=x1,
+                y1=y1,
+                x2=x2,
+                y2=y2,
+                skip_source_index=color ^ 1,
+            )
+        else:
+            for j in range(y1, y2):
+                for i in range(x1, x2):
+                    if bitmap[i, j] == color:
+                        canvas[x + i, y + j] = color
+        return advance
+
+    ###########################################################################
+    # Export
+
+    def save(self, file: Union[str, BinaryIO], format: Optional[str] = None) -> None:
+        """
+        Save the drawing as an indexed BMP or PNG image. The canvas is
+        written one row at a time, so no full copy of it is held in memory.
+        Background pictures, stamps and the turtle itself are not included.
+
+        :param file: a filename or a writable binary stream
+        :param format: "bmp" or "png"; if not given, it is taken from the
+         filename extension and defaults to "bmp"
+
+        """
+        if format is None:
+            format = "bmp"
+            if isinstance(file, str) and file.lower().endswith(".png"):
+                format = "png"
+        if format not in {"bmp", "png"}:
+            raise ValueError("Format must be 'bmp' or 'png'")
+        self.flush()
+        if isinstance(file, str):
+            with open(file, "wb") as stream:
+                self._save(stream, format)
+        else:
+            self._save(file, format)
+
+    def _save(self, stream: BinaryIO, format: str) -> None:
+        import struct
+
+        colors = self._colors
+        # BMP has no 2-bit format
+        bits = 4 if format == "bmp" and len(colors) == 4 else len(colors).bit_length() - 1
+        stride = (self._w * bits + 7) // 8
+        if format == "bmp":
+            padded = (stride + 3) & ~3
+            offset = 14 + 40 + 4 * len(colors)
+            stream.write(
+                struct.pack(
+                    "<2sIHHIIiiHHIIiiII",
+                    b"BM",
+                    offset + padded * self._h,
+                    0,
+                    0,
+                    offset,
+                    40,
+                    self._w,
+                    self._h,
+                    1,
+                    bits,
+                    0,
+                    padded * self._h,
+                    2835,
+                    2835,
+                    len(colors),
+                    0,
+                )
+            )
+            for c in colors:
+                stream.write(struct.pack("<I", c))
+            row = bytearray(padded)
+            for y in range(self._h - 1, -1, -1):
+                self._read_row(y, row, bits)
+                stream.write(row)
+            return
+        try:
+            import zlib
+
+            compressor = zlib.compressobj()
+        except (ImportError, AttributeError) as err:
+            raise RuntimeError("PNG export requires zlib compression support") from err
+
+        def chunk(tag: bytes, data: bytes) -> None:
+            stream.write(struct.pack(">I", len(data)))
+            stream.write(tag)
+            stream.write(data)
+            stream.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(tag))))
+
+        stream.write(b"\x89PNG\r\n\x1a\n")
+        chunk(b"IHDR", struct.pack(">IIBBBBB", self._w, self._h, bits, 3, 0, 0, 0))
+        chunk(b"PLTE", b"".join(struct.pack(">I", c)[1:] for c in colors))
+        # each row starts with filter type 0 (none)
+        row = bytearray(stride + 1)
+        view = memoryview(row)[1:]
+        pending = bytearray()
+        for y in range(self._h):
+            self._read_row(y, view, bits)
+            pending.extend(compressor.compress(row))
+            if len(pending) >= 4096:
+                chunk(b"IDAT", pending)
+                pending = bytearray()
+        pending.extend(compressor.flush())
+        chunk(b"IDAT", pending)
+        chunk(b"IEND", b"")
+
+    def _read_row(self, y: int, row: Union[bytearray, memoryview], bits: int) -> None:
+        """Pack one canvas row into row, most significant bits first"""
+        bitmap = self._fg_bitmap
+        per_byte = 8 // bits
+        x = 0
+        for i in range(len(row)):
+            byte = 0
+            for _ in range(per_byte):
+                byte <<= bits
+                if x < self._w:
+                    byte |= bitmap[x, y]
+                x += 1
+            row[i] = byte
+
+    ###########################################################################
+    # Frame capture
+
+    def _touched(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        """Note that canvas pixels x0..x1, y0..y1 were written, for frame capture"""
+        if self._capture is not None:
+            box = self._capture[0]
+            box[0] = min(box[0], x0)
+            box[1] = min(box[1], y0)
+            box[2] = max(box[2], x1)
+            box[3] = max(box[3], y1)
+
+    def _capture_frame(self) -> None:
+        """Take a frame, if it is time for one; see adafruit_turtle_host"""
+
+    ###########################################################################
+    # Snapshots
+
+    # the pen size is a double, since pensize() takes any positive number
+    _SNAPSHOT_HEADER = ">4sHHdddBdBB"
+
+    def snapshot(self, file: Optional[Union[str, BinaryIO]] = None) -> Optional[bytes]:
+        """
+        Capture the canvas together with the turtle's position, heading, pen
+        state and colors so it can be brought back with restore().
+
+        If no file is given, return a compact run-length encoded snapshot.
+        Otherwise write a raw snapshot to file: a fixed header followed by
+        one byte per pixel, row by row, which can be memory-mapped.
+
+        :param file: None, a filename or a writable binary stream
+
+        """
+        import struct
+
+        self.flush()
+        raw = file is not None
+        header = struct.pack(
+            self._SNAPSHOT_HEADER,
+            b"TSNR" if raw else b"TSNL",
+            self._w,
+            self._h,
+            self._x,
+            self._y,
+            self._heading,
+            self._penstate,
+            self._pensize,
+            self._pencolor,
+            self._bg_color,
+        )
+        bitmap = self._fg_bitmap
+        if raw:
+            if isinstance(file, str):
+                with open(file, "wb") as stream:
+                    self._write_raw(stream, header)
+            else:
+                self._write_raw(file, header)
+            return None
+        data = bytearray(header)
+        value = bitmap[0, 0]
+        count = 0
+        for y in range(self._h):
+            for x in range(self._w):
+                v = bitmap[x, y]
+                if v != value or count == 255:
+                    data.append(count)
+                    data.append(value)
+                    value = v
+                    count = 0
+                count += 1
+        data.append(count)
+        data.append(value)
+        return bytes(data)
+
+    def _write_raw(self, stream: BinaryIO, header: bytes) -> None:
+        stream.write(header)
+        bitmap = self._fg_bitmap
+        row = bytearray(self._w)
+        for y in range(self._h):
+            for x in range(self._w):
+                row[x] = bitmap[x, y]
+            stream.write(row)
+
+    def restore(self, source: Union[bytes, bytearray, memoryview, str, BinaryIO]) -> None:
+        """
+        Bring back a canvas and turtle state captured by snapshot(). The
+        pixels are copied straight into the canvas; nothing is redrawn.
+
+        :param source: a snapshot returned by snapshot(), a filename or
+         readable binary stream of a raw snapshot, or a buffer holding one
+         (for instance a memory-mapped raw snapshot file)
+
+        """
+        if isinstance(source, str):
+            with open(source, "rb") as stream:
+                try:
+                    import mmap
+                except ImportError:
+                    self._restore(None, stream)
+                    return
+                with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    self._restore(data, None)
+        elif not isinstance(source, (bytes, bytearray, memoryview)) and hasattr(source, "read"):
+            self._restore(None, source)
+        else:
+            self._restore(source, None)
+
+    def _restore(self, source, stream: Optional[BinaryIO]) -> None:
+        """Restore a snapshot held in the buffer source, or read from stream"""
+        import struct
+
+        size = struct.calcsize(self._SNAPSHOT_HEADER)
+        if stream is not None:
+            source = stream.read(size)
+        kind = self._restore_state(source[:size])
+        bitmap = self._fg_bitmap
+        w = self._w
+        if kind == b"TSNR" and isinstance(bitmap, displayio.Bitmap):
+            import bitmaptools
+
+            if stream is not None:
+                bitmaptools.readinto(bitmap, stream, 8)
+            else:
+                bitmaptools.arrayblit(bitmap, memoryview(source)[size:])
+            return
+        # start from the background, then fill the other runs
+        bitmap.fill(self._bg_color)
+        if kind == b"TSNR":
+            # bitmaptools cannot reach the tiles of a TiledCanvas: go by rows
+            row = bytearray(w)
+            for y in range(self._h):
+                if stream is not None:
+                    stream.readinto(row)
+                else:
+                    row[:] = source[size + y * w : size + (y + 1) * w]
+                x = 0
+                while x < w:
+                    value = row[x]
+                    end = x + 1
+                    while end < w and row[end] == value:
+                        end += 1
+                    if value != self._bg_color:
+                        self._fill_row(x, y, end - x, value)
+                    x = end
+            return
+        if stream is not None:
+            source += stream.read()
+        # run-length encoded
+        p = 0
+        for i in range(size, len(source), 2):
+            count = source[i]
+            value = source[i + 1]
+            while value != self._bg_color and count:
+                y, x = divmod(p, w)
+                span = min(count, w - x)
+                self._fill_row(x, y, span, value)
+                p += span
+                count -= span
+            p += count
+
+    def _restore_state(self, header: bytes) -> bytes:
+        """Apply the turtle state from a snapshot header, return its kind"""
+        import struct
+
+        (kind, w, h, x, y, heading, down, size, pencolor, bg_color) = struct.unpack(
+            self._SNAPSHOT_HEADER, header
+        )
+        if kind not in {b"TSNR", b"TSNL"}:
+            raise ValueError("Not a turtle snapshot")
+        if (w, h) != (self._w, self._h):
+            raise ValueError("Snapshot does not match the canvas size")
+        self.flush()
+        self._undo_reset()
+        self._forget_segments()
+        if self._index is not None:
+            self._index.clear()
+        self._touched(0, 0, self._w - 1, self._h - 1)
+        self._x = self._turtle_x = x
+        self._y = self._turtle_y = y
+        self._heading = heading
+        self._penstate = bool(down)
+        self._pensize = int(size) if size == int(size) else size
+        self._set_pencolor(pencolor)
+        self._set_bg_color(bg_color)
+        self._drawturtle()
+        return kind
+
+    ###########################################################################
+    # Undo
+
+    def setundobuffer(self, size: Optional[int], memory: int = 8192) -> None:
+        """
+        Set or disable the undo buffer. If size is an integer, an empty undo
+        buffer of that size is installed: size is the maximum number of turtle
+        actions that can be undone by undo(). If size is None, the undo buffer
+        is disabled (the default).
+
+        Each action keeps only the pixels it changed, as spans along the rows
+        with the old values packed two to a byte, so undoing does not redraw
+        anything. When the actions kept take more than memory bytes, the
+        oldest are dropped; an action larger than that cannot be undone.
+
+        :param size: the number of actions to keep, or None
+        :param memory: the most bytes of changed pixels to keep
+
+        """
+        if size is None or size < 1:
+            self._undobuffer = None
+        else:
+            self._undobuffer = []
+        self._undo_size = size or 0
+        self._undo_memory = memory
+        self._undo_bytes = 0
+
+    def undobufferentries(self) -> int:
+        """Return the number of entries in the undo buffer."""
+        if self._undobuffer is None:
+            return 0
+        return len(self._undobuffer)
+
+    def undo(self) -> None:
+        """
+        Undo the last turtle action (a move, turn, dot, circle or pen
+        change), even one that changed nothing. Restores the pixels it
+        overwrote and the turtle's previous position, heading and pen."""
+        if not self._undobuffer:
+            return
+        self.flush()
+        self._forget_segments()
+        state, spans, values = self._undobuffer.pop()
+        self._undo_bytes -= 2 * len(spans) + len(values)
+        bitmap = self._fg_bitmap
+        n = 0
+        for i in range(0, len(spans), 3):
+            x, y, count = spans[i], spans[i + 1], spans[i + 2]
+            end = n + count
+            while n < end:
+                # a run of pixels that get the same value back
+                value = (values[n >> 1] >> ((n & 1) * 4)) & 15
+                run = n + 1
+                while run < end and (values[run >> 1] >> ((run & 1) * 4)) & 15 == value:
+                    run += 1
+                if run - n == 1:
+                    bitmap[x, y] = value
+                    self._touched(x, y, x, y)
+                else:
+                    self._fill_row(x, y, run - n, value)
+                x += run - n
+                n = run
+        (self._x, self._y, self._heading, self._penstate, self._pensize, pencolor, drawn) = state
+        self._set_pencolor(pencolor)
+        if self._index is not None:
+            self._index.truncate(drawn)
+        self._turtle_x = self._x
+        self._turtle_y = self._y
+        self._drawturtle()
+
+    def _undo_state_now(self) -> tuple:
+        # the last item is how many lines and dots the spatial index holds
+        return (
+            self._x,
+            self._y,
+            self._heading,
+            self._penstate,
+            self._pensize,
+            self._pencolor,
+            0 if self._index is None else len(self._index.items),
+        )
+
+    def _undo_begin(self) -> None:
+        if self._undobuffer is None:
+            return
+        self._undo_nesting += 1
+        if self._undo_nesting == 1:
+            # queued strokes must not be journaled as part of this action
+            self.flush()
+            self._undo_state = self._undo_state_now()
+            self._canvas = _UndoRecorder(self._fg_bitmap)
+
+    def _undo_end(self) -> None:
+        if self._undobuffer is None or self._undo_nesting == 0:
+            return
+        self._undo_nesting -= 1
+        if self._undo_nesting:
+            return
+        self.flush()
+        spans, values = self._canvas.pack()
+        self._canvas = self._writer
+        if self._capture is not None:
+            for i in range(0, len(spans), 3):
+                self._touched(spans[i], spans[i + 1], spans[i] + spans[i + 2] - 1, spans[i + 1])
+        # even an action that changed nothing gets an entry, so that undo()
+        # always takes back the last one
+        buffer = self._undobuffer
+        buffer.append((self._undo_state, spans, values))
+        self._undo_bytes += 2 * len(spans) + len(values)
+        while buffer and (len(buffer) > self._undo_size or self._undo_bytes > self._undo_memory):
+            _, spans, values = buffer.pop(0)
+            self._undo_bytes -= 2 * len(spans) + len(values)
+
+    def _undo_reset(self) -> None:
+        """Forget the undo history after the canvas is changed wholesale"""
+        if self._undobuffer is not None:
+            self._undobuffer = []
+            self._undo_bytes = 0
+
+    ###########################################################################
+    # Background rendering
+
+    def flush(self) -> None:
+        """
+        Wait until every queued drawing command has reached the canvas.
+        Does nothing unless drawing is queued, as with the render worker of
+        `adafruit_turtle_host`."""
+        if self._render_queue is not None:
+            self._render_queue.join()
+
+    ###########################################################################
+    # Remote control
+
+    # how many arguments each opcode has
+    _COMMAND_ARGS = b"\x00\x02\x01\x01\x01\x00\x00\x01\x01\x01\x01\x00\x02"
+
+    def receive(self, stream, buffer_size: int = 256) -> None:
+        """
+        Carry out the commands an `adafruit_turtle_host.CommandEncoder`
+        sent over stream, as they arrive, until its end() command or the end
+        of the stream. The stream can be anything with readinto() or
+        recv_into(): a UART, USB serial, a pipe or a socket. Commands are
+        decoded from one reused buffer, so none of them allocates memory.
+        Angles are taken to be in degrees.
+        The stream may be split across several receive() calls; the last
+        goto() target and turn carry over, and so do the bytes read past
+        end(), which the next receive() carries out first.
+
+        :param stream: where the commands come from
+        :param buffer_size: how many bytes to read at once
+
+        """
+        read = getattr(stream, "readinto", None) or stream.recv_into
+        rest = self._receive_rest
+        buffer_size = max(buffer_size, len(rest))
+        buffer = bytearray(buffer_size)
+        buffer[: len(rest)] = rest
+        view = memoryview(buffer)
+        args = array.array("l", (0, 0))
+        counts = self._COMMAND_ARGS
+        # the last goto() target, which the next one is relative to, and the
+        # last turn, which AGAIN repeats; both carry over to the next receive()
+        received = self._received
+        start = 0
+        end = len(rest)
+        while True:
+            while start < end:
+                opcode = buffer[start]
+                if opcode >= len(counts):
+                    raise ValueError("Unknown command")
+                i = start + 1
+                for slot in range(counts[opcode]):
+                    value = 0
+                    shift = 0
+                    while i < end:
+                        byte = buffer[i]
+                        i += 1
+                        value |= (byte & 0x7F) << shift
+                        if byte < 0x80:
+                            break
+                        shift += 7
+                    else:
+                        i = -1
+                        break
+                    args[slot] = (value >> 1) ^ -(value & 1)
+                if i < 0:
+                    # the rest of it has not arrived yet
+                    break
+                start = i
+                if opcode == _OP_GOTO:
+                    received[0] += args[0]
+                    received[1] += args[1]
+                    self.goto(received[0], received[1])
+                elif opcode == _OP_FORWARD:
+                    self.forward(args[0])
+                elif opcode == _OP_LEFT:
+                    received[2] = args[0] / 100
+                    self.left(received[2])
+                elif opcode == _OP_AGAIN:
+                    for _ in range(args[0]):
+                        self.left(received[2])
+                elif opcode == _OP_PENUP:
+                    self.penup()
+                elif opcode == _OP_PENDOWN:
+                    self.pendown()
+                elif opcode == _OP_PENSIZE:
+                    self.pensize(args[0])
+                elif opcode == _OP_PENCOLOR:
+                    self.pencolor(args[0])
+                elif opcode == _OP_SETHEADING:
+                    self.setheading(args[0] / 100)
+                elif opcode == _OP_DOT:
+                    self.dot(args[0])
+                elif opcode == _OP_CLEAR:
+                    self.clear()
+                elif opcode == _OP_CIRCLE:
+                    self.circle(args[0], args[1] / 100)
+                else:
+                    self._receive_rest = buffer[start:end]
+                    return
+            # keep the start of a command that was cut off
+            for i in range(end - start):
+                buffer[i] = buffer[start + i]
+            end -= start
+            start = 0
+            if end == buffer_size:
+                raise ValueError("Command longer than the buffer")
+            n = read(view[end:])
+            if n == 0:
+                self._receive_rest = buffer[:end]
+                return
+            if n:
+                end += n
+
     ###########################################################################
     # Visibility
 
@@ -1125,6 +2745,7 @@ class turtle:
             self._turtle_group.append(self._turtle_sprite)
         else:
             self._turtle_group.append(self._turtle_alt_sprite)
+        self._drawturtle()
 
     st = showturtle
 
@@ -1144,6 +2765,166 @@ class turtle:
             return True
         return False
 
+    def rotateturtle(self, buckets: int = 16, memory: int = 8192) -> None:
+        """
+        Turn the turtle shape with the turtle's heading. The shape should
+        point to the right (east). Turned copies of it are made for buckets
+        evenly spaced angles, the first time each is needed, and the closest
+        one is shown; pixels the shape does not cover take the value of its
+        top left pixel, which should be transparent. The default shape,
+        single tile TileGrid shapes and images loaded into RAM (see
+        setimagecache()) can be turned; images read from the file are shown
+        as they are, since their pixels can't be read back.
+
+        :param buckets: how many angles to turn the shape to, or 0 to stop
+         turning it
+        :param memory: how many bytes the turned copies may use; the least
+         recently shown ones are dropped to stay under it
+
+        """
+        if buckets < 0:
+            raise ValueError("buckets must not be negative")
+        self._forget_turned_shapes()
+        self._shape_buckets = buckets
+        self._shape_memory = memory
+        self._drawturtle()
+
+    def _forget_turned_shapes(self) -> None:
+        """Drop the turned shapes, showing the turtle shape as it is"""
+        if self._shape_buckets and self._turtle_group:
+            base = self._turtle_sprite if self._turtle_pic is None else self._turtle_alt_sprite
+            if self._turtle_group[0] is not base:
+                self._turtle_group[0] = base
+        self._shape_cache = {}
+        self._shape_source = None
+
+    def _turned_shape(self) -> Optional[list]:
+        """The [tilegrid, side, size, last used] of the turtle shape turned to the
+        closest bucket angle, or None if the shape is shown as it is"""
+        angle = (self._angleOffset + self._angleOrient * self._heading) % self._fullcircle
+        # degrees clockwise from east, which the shape points to
+        angle = angle * 360 / self._fullcircle - 90
+        bucket = round(angle * self._shape_buckets / 360) % self._shape_buckets
+        if bucket == 0:
+            return None
+        self._shape_tick += 1
+        turned = self._shape_cache.get(bucket)
+        if turned is None:
+            turned = self._turn_shape(bucket * 2 * math.pi / self._shape_buckets)
+            if turned is None:
+                return None
+            self._shape_cache[bucket] = turned
+        turned[3] = self._shape_tick
+        return turned
+
+    def _turn_shape(self, radians: float) -> Optional[list]:
+        """Make a copy of the turtle shape turned clockwise by radians, if it
+        can be turned and fits in the memory allowed"""
+        if self._shape_source is None:
+            sprite = self._turtle_sprite if self._turtle_pic is None else self._turtle_alt_sprite
+            bitmap = sprite.bitmap
+            if not isinstance(bitmap, displayio.Bitmap):
+                # the pixels of an OnDiskBitmap can't be read back
+                return None
+            if sprite.width != 1 or sprite.height != 1 or sprite.tile_width != bitmap.width:
+                return None
+            shader = sprite.pixel_shader
+            values = len(shader) if isinstance(shader, displayio.Palette) else 1 << 24
+            self._shape_source = (bitmap, shader, values)
+        bitmap, shader, values = self._shape_source
+        width = bitmap.width
+        height = bitmap.height
+        side = math.ceil(math.sqrt(width**2 + height**2))
+        bits = 1
+        while 1 << bits < values:
+            bits *= 2
+        size = (side * bits + 31) // 32 * 4 * side
+        if size > self._shape_memory:
+            return None
+        used = sum(turned[2] for turned in self._shape_cache.values())
+        while used + size > self._shape_memory:
+            oldest = min(self._shape_cache, key=lambda k: self._shape_cache[k][3])
+            used -= self._shape_cache.pop(oldest)[2]
+        blank = bitmap[0, 0]
+        turned = displayio.Bitmap(side, side, values)
+        turned.fill(blank)
+        cos = math.cos(radians)
+        sin = math.sin(radians)
+        middle = (side - 1) / 2
+        # map every pixel back to the nearest one of the shape
+        for y in range(side):
+            dy = y - middle
+            for x in range(side):
+                dx = x - middle
+                sx = math.floor(cos * dx + sin * dy + (width - 1) / 2 + 0.5)
+                sy = math.floor(cos * dy - sin * dx + (height - 1) / 2 + 0.5)
+                if 0 <= sx < width and 0 <= sy < height:
+                    turned[x, y] = bitmap[sx, sy]
+        return [displayio.TileGrid(turned, pixel_shader=shader), side, size, 0]
+
+    def setimagecache(self, size: int = 8, promote: int = 0) -> None:
+        """
+        Set up the cache of image files used by changeturtle(), stamp() and
+        bgpic(). Each file is opened once and shared by everything showing
+        it, so switching between a few turtle shapes does no file I/O.
+
+        :param size: how many images to keep open once nothing shows them
+        :param promote: images of up to this many pixels are loaded into RAM
+         (with ``adafruit_imageload``) instead of being read from the file
+         each time they are drawn; 0 keeps every image on disk
+
+        """
+        self._image_cache_size = size
+        self._image_promote = promote
+        self._trim_images()
+
+    def _open_image(self, path: str) -> Tuple[displayio.Bitmap, displayio.Palette]:
+        """The bitmap and pixel shader of an image file, opened only if it is not
+        cached; every call must be matched by a _release_image()"""
+        self._image_tick += 1
+        entry = self._images.get(path)
+        if entry is None:
+            image = displayio.OnDiskBitmap(path)
+            shader = image.pixel_shader
+            if image.width * image.height <= self._image_promote and isinstance(
+                shader, displayio.Palette
+            ):
+                try:
+                    import adafruit_imageload
+                except ImportError:
+                    pass
+                else:
+                    image, shader = adafruit_imageload.load(
+                        path, bitmap=displayio.Bitmap, palette=displayio.Palette
+                    )
+            entry = [image, shader, 0, 0]
+            self._images[path] = entry
+        entry[2] += 1
+        entry[3] = self._image_tick
+        self._trim_images()
+        return entry[0], entry[1]
+
+    def _release_image(self, path: str) -> None:
+        """Count one user less of an image file"""
+        entry = self._images.get(path)
+        if entry is not None and entry[2]:
+            entry[2] -= 1
+            self._trim_images()
+
+    def _release_turtle_image(self) -> None:
+        if self._turtle_odb_file is not None:
+            self._release_image(self._turtle_odb_file)
+        self._turtle_odb = None
+        self._turtle_odb_file = None
+
+    def _trim_images(self) -> None:
+        """Close the least recently used images nothing shows, down to the cache size"""
+        idle = [path for path, entry in self._images.items() if not entry[2]]
+        while len(idle) > self._image_cache_size:
+            oldest = min(idle, key=lambda path: self._images[path][3])
+            idle.remove(oldest)
+            del self._images[oldest]
+
     # pylint:disable=too-many-statements, too-many-branches
     def changeturtle(
         self,
@@ -1156,47 +2937,35 @@ class turtle:
         if a tilegrid is provided, it replace the default one for the turtle shape.
         if no argument is provided, the default shape will be restored
         """
+        if source is None and self._turtle_pic is None:
+            return
+        self._forget_turned_shapes()
         if source is None:
-            if self._turtle_pic is None:
-                return
             if self._turtle_group:
                 self._turtle_group.remove(self._turtle_alt_sprite)
                 self._turtle_group.append(self._turtle_sprite)
             self._turtle_alt_sprite = None
-            if self._turtle_odb is not None:
-                self._turtle_odb_use -= 1
-                self._turtle_odb = None
-            if self._turtle_odb_file is not None:
-                self._turtle_odb_file = None
+            self._release_turtle_image()
             self._turtle_pic = None
             self._drawturtle()
             return
         if isinstance(source, str):
             visible = self.isvisible()
+            try:
+                image, shader = self._open_image(source)
+            except:
+                self._drawturtle()
+                raise
             if self._turtle_pic is not None:
                 if self._turtle_group:
                     self._turtle_group.remove(self._turtle_alt_sprite)
-                self._turtle_alt_sprite = None
-                self._turtle_odb = None
-                if not isinstance(self._turtle_pic, tuple):
-                    self._turtle_odb_file = None
-                    self._turtle_odb_use -= 1
-                self._turtle_pic = None
-
-            try:
-                self._turtle_odb = displayio.OnDiskBitmap(source)
-            except:
-                self._turtle_odb_file = None
-                self._turtle_pic = None
-                if visible:
                     self._turtle_group.append(self._turtle_sprite)
-                raise
-            self._turtle_odb_use += 1
+                self._turtle_alt_sprite = None
+                self._release_turtle_image()
+            self._turtle_odb = image
+            self._turtle_odb_file = source
             self._turtle_pic = True
-            self._turtle_alt_sprite = displayio.TileGrid(
-                self._turtle_odb,
-                pixel_shader=self._turtle_odb.pixel_shader,
-            )
+            self._turtle_alt_sprite = displayio.TileGrid(image, pixel_shader=shader)
 
             if self._turtle_group:
                 self._turtle_group.pop()
@@ -1204,9 +2973,7 @@ class turtle:
                 self._turtle_group.append(self._turtle_alt_sprite)
             self._drawturtle()
         elif isinstance(source, displayio.TileGrid):
-            if self._turtle_pic is not None:
-                if self._turtle_odb_file is not None:
-                    self._turtle_odb_use -= 1
+            self._release_turtle_image()
             self._turtle_pic = dimensions
             self._turtle_alt_sprite = source
             if self._turtle_group:
@@ -1221,7 +2988,22 @@ class turtle:
     ###########################################################################
     # Other
 
+    def _sleep(self, seconds: float) -> None:
+        """Pause between animation steps"""
+        time.sleep(seconds)
+
     def _turn(self, angle: float) -> None:
+        self._undo_begin()
+        try:
+            self._do_turn(angle)
+        finally:
+            self._undo_end()
+        if self._shape_buckets:
+            self._drawturtle()
+        elif self._capture is not None:
+            self._capture_frame()
+
+    def _do_turn(self, angle: float) -> None:
         if angle % self._fullcircle == 0:
             return
         if not self.isdown() or self._pensize == 1:
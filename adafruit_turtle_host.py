@@ -0,0 +1,1248 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_turtle_host`
+================================================================================
+
+A turtle with extra features for CPython hosts, such as a Linux computer
+running Blinka. They are kept out of `adafruit_turtle`, which stays small for
+microcontrollers.
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* Adafruit Blinka and Blinka displayio:
+  https://github.com/adafruit/Adafruit_Blinka_Displayio
+"""
+
+from __future__ import annotations
+
+import array
+import math
+import time
+
+import adafruit_turtle
+
+try:
+    from typing import BinaryIO, List, Optional, Tuple, Union
+except ImportError:
+    pass
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_turtle.git"
+
+
+class turtle(adafruit_turtle.turtle):
+    """An `adafruit_turtle.turtle` with features for CPython hosts. It takes
+    the same arguments."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._render_thread = None
+        self._trace_names = None
+        self._canvas_clips = None
+
+    def _clips(self) -> bool:
+        """Whether an off-canvas write to the canvas is dropped, as on Blinka,
+        rather than raising IndexError, which makes a thin pen fall back to
+        a nib"""
+        if self._canvas_clips is None:
+            try:
+                self._fg_bitmap[self._w, 0] = 0
+                self._canvas_clips = True
+            except IndexError:
+                self._canvas_clips = False
+        return self._canvas_clips
+
+    ###########################################################################
+    # Batch drawing
+
+    def _draw_segments(self, segments, color, width, angle, slant) -> None:
+        """Rasterize all the segments of draw_segments() together with NumPy
+        and write the pixels in row runs, or one at a time without NumPy"""
+        try:
+            import numpy
+        except ImportError:
+            super()._draw_segments(segments, color, width, angle, slant)
+            return
+        self._draw_segments_numpy(numpy, segments, color, width, angle, slant)
+
+    @staticmethod
+    def _numpy_line(np, x0, y0, x1, y1):
+        """Vectorized form of the Bresenham walk in _raster_line and
+        _plot_pen: every point of every line, in drawing order"""
+        steep = abs(y1 - y0) > abs(x1 - x0)
+        a0 = np.where(steep, y0, x0)
+        a1 = np.where(steep, y1, x1)
+        b0 = np.where(steep, x0, y0)
+        b1 = np.where(steep, x1, y1)
+        dx = abs(a1 - a0)
+        dy = abs(b1 - b0)
+        count = dx + 1
+        owner = np.repeat(np.arange(len(count)), count)
+        j = np.arange(int(count.sum())) - np.repeat(np.cumsum(count) - count, count)
+        dx = dx[owner]
+        # number of times err = dx / 2 - j * dy dropped below zero so far
+        k = -((dx - 2 * j * dy[owner]) // np.maximum(2 * dx, 1))
+        major = a0[owner] + np.where(a0 > a1, -1, 1)[owner] * j
+        ystep = np.where(b0 < b1, 1, -1)[owner]
+        minor = b0[owner] + ystep * k
+        return major, minor, steep[owner], owner, b1[owner], ystep
+
+    def _draw_segments_numpy(self, np, segments, color, width, angle, slant) -> None:
+        seg = np.asarray(segments, dtype=float).reshape(-1, 4)
+        w, h = self._w, self._h
+        screen = np.empty(seg.shape, dtype=np.int64)
+        screen[:, 0::2] = np.round(seg[:, 0::2] + w // 2)
+        screen[:, 1::2] = np.round(h // 2 - seg[:, 1::2])
+        color = np.broadcast_to(np.asarray(color, dtype=np.int64), len(seg))
+        width = np.broadcast_to(np.asarray(width, dtype=np.int64), len(seg))
+        sin = math.sin(math.radians(angle))
+        cos = math.cos(math.radians(angle))
+        clips = self._clips()
+        for start in range(0, len(seg), 4096):
+            part = screen[start : start + 4096]
+            major, minor, steep, owner, _, _ = self._numpy_line(
+                np, part[:, 0], part[:, 1], part[:, 2], part[:, 3]
+            )
+            cx = np.where(steep, minor, major)
+            cy = np.where(steep, major, minor)
+            size = width[start : start + 4096][owner]
+            c = color[start : start + 4096][owner]
+            inside = (cx >= 0) & (cx < w) & (cy >= 0) & (cy < h)
+            single = size == 1
+            if clips:
+                nib = ~single
+            else:
+                nib = ~(single & inside)
+            xs = [cx[single & inside]]
+            ys = [cy[single & inside]]
+            cs = [c[single & inside]]
+            segment = [owner[single & inside]]
+            if nib.any():
+                cx, cy, size, c, segment0 = cx[nib], cy[nib], size[nib], c[nib], owner[nib]
+                r = size // 2 + 1
+                ends = (
+                    cx + sin * r,
+                    cy - cos * r,
+                    cx - sin * (size - r),
+                    cy + cos * (size - r),
+                )
+                ends = [np.where(v >= 0, np.ceil(v), np.floor(v)).astype(np.int64) for v in ends]
+                major, minor, steep, owner, last, ystep = self._numpy_line(np, *ends)
+                c = c[owner]
+                segment0 = segment0[owner]
+                xs.append(np.where(steep, minor, major))
+                ys.append(np.where(steep, major, minor))
+                cs.append(c)
+                segment.append(segment0)
+                if slant:
+                    # the second row that fills the cracks
+                    crack = minor != last
+                    minor = minor[crack] + ystep[crack]
+                    major = major[crack]
+                    steep = steep[crack]
+                    xs.append(np.where(steep, minor, major))
+                    ys.append(np.where(steep, major, minor))
+                    cs.append(c[crack])
+                    segment.append(segment0[crack])
+            # put the pixels back in segment order so later segments win
+            order = np.argsort(np.concatenate(segment), kind="stable")
+            self._write_pixels(
+                np,
+                np.concatenate(xs)[order],
+                np.concatenate(ys)[order],
+                np.concatenate(cs)[order],
+            )
+
+    def _write_pixels(self, np, x, y, c) -> None:
+        """Write pixels to the canvas, later ones winning, in row runs"""
+        w = self._w
+        inside = (x >= 0) & (x < w) & (y >= 0) & (y < self._h)
+        flat = (y * w + x)[inside][::-1]
+        c = c[inside][::-1]
+        flat, first = np.unique(flat, return_index=True)
+        if not len(flat):
+            return
+        c = c[first]
+        canvas = self._canvas
+        if canvas is not self._writer:
+            # journaling undo: every pixel goes through the recorder
+            for p, v in zip(flat.tolist(), c.tolist()):
+                canvas[p % w, p // w] = v
+            return
+        breaks = (np.diff(flat) != 1) | (np.diff(c) != 0) | (flat[1:] % w == 0)
+        starts = np.concatenate(([0], np.flatnonzero(breaks) + 1))
+        counts = np.diff(np.concatenate((starts, [len(flat)])))
+        for p, n, v in zip(flat[starts].tolist(), counts.tolist(), c[starts].tolist()):
+            y, x = divmod(p, w)
+            if n == 1:
+                canvas[x, y] = v
+            else:
+                self._fill_row(x, y, n, v)
+
+    ###########################################################################
+    # Background rendering
+
+    def start_render_worker(self, queue_size: int = 64) -> None:
+        """
+        Rasterize lines and dots on a background thread. Drawing calls then
+        only queue compact commands and return; when queue_size commands are
+        pending, they block until the worker catches up. State queries such
+        as pos() and heading() are answered at once. If a queued command
+        fails, the error is raised by the next drawing call, flush() or join().
+
+        :param queue_size: how many commands may be pending before drawing
+         calls wait for the worker
+
+        """
+        if self._render_queue is not None:
+            return
+        import threading
+
+        self._render_queue = _RenderQueue(queue_size)
+        self._render_thread = threading.Thread(target=self._render_queue.work, daemon=True)
+        self._render_thread.start()
+
+    def join(self) -> None:
+        """
+        Finish all queued drawing and stop the render worker."""
+        if self._render_thread is None:
+            return
+        commands = self._render_queue
+        commands.stop()
+        self._render_thread.join()
+        self._render_queue = None
+        self._render_thread = None
+        commands.raise_error()
+
+    ###########################################################################
+    # Parallel rendering
+
+    def start_recording(self) -> None:
+        """
+        Record lines and dots instead of drawing them, to draw them all at
+        once with render_parallel(). The turtle moves as usual in the
+        meantime. Use it for large off-screen canvases on a multi-core
+        computer.
+
+        Until render_parallel(), clear() drops what was recorded, and calls
+        that need the strokes on the canvas, such as flush(), draw_segments(),
+        write(), save(), snapshot(), restore() and undo(), raise RuntimeError.
+        """
+        if self._render_queue is not None:
+            raise RuntimeError("Already recording or rendering in the background")
+        if self._undobuffer is not None:
+            raise RuntimeError("Disable the undo buffer before recording")
+        self._render_queue = _CommandLog()
+
+    def render_parallel(self, processes: Optional[int] = None) -> None:
+        """
+        Draw what was recorded since start_recording(), and stop recording.
+        The canvas is cut into bands of rows, and a pool of processes
+        rasterizes, for each band, the recorded strokes that reach into it.
+        The bands are drawn into one shared buffer that is then written to
+        the canvas. The pixels are the same as when drawing directly.
+        CPython only.
+
+        :param processes: how many processes to use (default: one per CPU)
+
+        """
+        log = self._render_queue
+        if not isinstance(log, _CommandLog):
+            raise RuntimeError("Not recording")
+        self._render_queue = None
+        commands = log.commands
+        if not commands:
+            return
+        try:
+            import multiprocessing
+            from multiprocessing import shared_memory
+        except ImportError as err:
+            raise RuntimeError("Parallel rendering requires multiprocessing") from err
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        w, h = self._w, self._h
+        bands = min(h, processes * 4)
+        band_rows = -(-h // bands)
+        # the rows each command can reach, with the pen nib around them
+        tasks = [[] for _ in range(bands)]
+        for command in commands:
+            if len(command) == 8:
+                ya, yb, size = command[1], command[3], command[5]
+            else:
+                ya = yb = command[1]
+                size = command[3]
+            top = max(0, int(min(ya, yb)) - size - 2)
+            bottom = min(h - 1, int(max(ya, yb)) + size + 2)
+            if top > bottom:
+                continue
+            for band in range(top // band_rows, bottom // band_rows + 1):
+                tasks[band].append(command)
+        clips = self._clips()
+        # pixels no command wrote keep a value no color has
+        memory = shared_memory.SharedMemory(create=True, size=w * h)
+        try:
+            memory.buf[:] = b"\xff" * (w * h)
+            with multiprocessing.Pool(processes) as pool:
+                pool.map(
+                    _render_band,
+                    [
+                        (memory.name, w, h, b * band_rows, (b + 1) * band_rows, clips, task)
+                        for b, task in enumerate(tasks)
+                        if task
+                    ],
+                )
+            self._undo_reset()
+            self._forget_segments()
+            self._paste_rendered(memory.buf)
+        finally:
+            memory.close()
+            memory.unlink()
+
+    def clear(self) -> None:
+        """Delete the turtle's drawings from the screen. Do not move turtle."""
+        log = self._render_queue
+        if not isinstance(log, _CommandLog):
+            super().clear()
+            return
+        # what was recorded so far would be cleared right after drawing it
+        log.commands.clear()
+        self._render_queue = None
+        try:
+            super().clear()
+        finally:
+            self._render_queue = log
+
+    def _paste_rendered(self, buffer) -> None:
+        """Write the pixels of a rendered buffer that were drawn to the canvas"""
+        w = self._w
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        if numpy is not None:
+            pixels = numpy.frombuffer(buffer, dtype=numpy.uint8)
+            drawn = numpy.flatnonzero(pixels != 255)
+            self._write_pixels(numpy, drawn % w, drawn // w, pixels[drawn].astype(numpy.int64))
+            del pixels
+            return
+        for y in range(self._h):
+            row = y * w
+            x = 0
+            while x < w:
+                value = buffer[row + x]
+                if value == 255:
+                    x += 1
+                    continue
+                end = x + 1
+                while end < w and buffer[row + end] == value:
+                    end += 1
+                self._fill_row(x, y, end - x, value)
+                x = end
+
+    ###########################################################################
+    # Frame capture
+
+    def _wrap_writer(self, writer):
+        if self._capture is not None:
+            return _DirtyTracker(writer, self._capture[0])
+        return writer
+
+    def start_capture(
+        self, file: Union[str, BinaryIO], interval: float = 0.1, format: Optional[str] = None
+    ) -> None:
+        """
+        Record the drawing as it is made, as an animated GIF or a frame log,
+        until stop_capture(). A frame is taken at most every interval seconds
+        while the turtle moves and turns, and only the box around the pixels
+        changed since the previous frame is encoded and written out, so the
+        file is written as it goes and the cost of a frame depends on how
+        much changed. Only the canvas is recorded, not the turtle sprite.
+
+        The frame log starts with ``>4sHHB``: b"TFLG", width, height and the
+        number of colors, each color follows as 3 bytes of RGB. Each frame
+        is ``>IHHHHI``: the time in ms, x, y, width and height of the changed
+        box and the size of its pixels, run-length encoded as (count, value)
+        byte pairs.
+
+        :param file: a filename or a writable binary stream
+        :param interval: the shortest time between frames, in seconds
+        :param format: "gif" or "log" (default: from the filename, else gif)
+
+        """
+        import struct
+
+        if format is None:
+            format = "log" if isinstance(file, str) and file.lower().endswith(".log") else "gif"
+        format = format.lower()
+        if format not in {"gif", "log"}:
+            raise ValueError("format must be 'gif' or 'log'")
+        self.stop_capture()
+        self.flush()
+        stream = open(file, "wb") if isinstance(file, str) else file
+        colors = self._colors
+        if format == "gif":
+            table = max(0, len(colors).bit_length() - 2)
+            header = b"GIF89a" + struct.pack(
+                "<HHBBB", self._view_w, self._view_h, 0xF0 | table, 0, 0
+            )
+        else:
+            header = struct.pack(">4sHHB", b"TFLG", self._view_w, self._view_h, len(colors))
+        stream.write(header)
+        for c in colors:
+            stream.write(bytes(((c >> 16) & 0xFF, (c >> 8) & 0xFF, c & 0xFF)))
+        if format == "gif":
+            # NETSCAPE2.0 extension: loop forever
+            stream.write(b"\x21\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00")
+        now = time.monotonic_ns()
+        # the changed box, the stream, whether to close it, the format, the
+        # interval, when the last frame was taken, when capture started and
+        # the last frame, which waits to be written until its delay is known
+        self._capture = [
+            [0, 0, self._w - 1, self._h - 1],
+            stream,
+            isinstance(file, str),
+            format,
+            int(interval * 1e9),
+            now - int(interval * 1e9),
+            now,
+            None,
+        ]
+        self._writer = self._wrap_writer(self._writer)
+        if self._undo_nesting == 0:
+            self._canvas = self._writer
+        self._capture_frame()
+
+    def stop_capture(self) -> None:
+        """
+        Take a last frame and finish the file started by start_capture()."""
+        capture = self._capture
+        if capture is None:
+            return
+        self.flush()
+        capture[5] = 0
+        self._capture_frame()
+        self._write_frame(capture[4] // 1000000)
+        stream = capture[1]
+        if capture[3] == "gif":
+            stream.write(b"\x3b")
+        if capture[2]:
+            stream.close()
+        self._capture = None
+        self._writer = self._writer.canvas
+        if self._undo_nesting == 0:
+            self._canvas = self._writer
+
+    def _capture_frame(self) -> None:
+        """Take a frame of what changed, if it is time for one"""
+        capture = self._capture
+        now = time.monotonic_ns()
+        if now - capture[5] < capture[4]:
+            return
+        self.flush()
+        box = capture[0]
+        # the changed part of the view, in view coordinates
+        x0 = max(box[0] - self._view_x, 0)
+        y0 = max(box[1] - self._view_y, 0)
+        x1 = min(box[2] - self._view_x, self._view_w - 1)
+        y1 = min(box[3] - self._view_y, self._view_h - 1)
+        box[0] = box[1] = 0x7FFFFFFF
+        box[2] = box[3] = -1
+        if x0 > x1 or y0 > y1:
+            return
+        capture[5] = now
+        if capture[7] is not None:
+            self._write_frame((now - capture[7][0]) // 1000000)
+        width = x1 - x0 + 1
+        height = y1 - y0 + 1
+        pixels = bytearray(width * height)
+        bitmap = self._fg_bitmap
+        i = 0
+        for y in range(y0 + self._view_y, y1 + self._view_y + 1):
+            for x in range(x0 + self._view_x, x1 + self._view_x + 1):
+                pixels[i] = bitmap[x, y]
+                i += 1
+        capture[7] = (now, x0, y0, width, height, pixels)
+
+    def _write_frame(self, delay: int) -> None:
+        """Write the waiting frame, shown for delay ms"""
+        import struct
+
+        capture = self._capture
+        if capture[7] is None:
+            return
+        taken, x, y, width, height, pixels = capture[7]
+        capture[7] = None
+        stream = capture[1]
+        if capture[3] == "log":
+            data = bytearray()
+            value = pixels[0]
+            count = 0
+            for v in pixels:
+                if v != value or count == 255:
+                    data.append(count)
+                    data.append(value)
+                    value = v
+                    count = 0
+                count += 1
+            data.append(count)
+            data.append(value)
+            stream.write(
+                struct.pack(
+                    ">IHHHHI", (taken - capture[6]) // 1000000, x, y, width, height, len(data)
+                )
+            )
+            stream.write(data)
+            return
+        # graphic control: keep the frame under the next one, delay in 1/100 s
+        stream.write(struct.pack("<BBBBHBB", 0x21, 0xF9, 4, 4, max(1, delay // 10), 0, 0))
+        stream.write(b"\x2c" + struct.pack("<HHHHB", x, y, width, height, 0))
+        min_size = max(2, (len(self._colors) - 1).bit_length())
+        stream.write(bytes((min_size,)))
+        data = self._lzw(pixels, min_size)
+        for i in range(0, len(data), 255):
+            block = data[i : i + 255]
+            stream.write(bytes((len(block),)))
+            stream.write(block)
+        stream.write(b"\x00")
+
+    @staticmethod
+    def _lzw(pixels: bytearray, min_size: int) -> bytearray:
+        """GIF LZW compression of pixels"""
+        clear = 1 << min_size
+        size = min_size + 1
+        next_code = clear + 2
+        codes = {}
+        out = bytearray()
+        bits = clear
+        count = size
+        prefix = pixels[0]
+        for i in range(1, len(pixels)):
+            k = pixels[i]
+            key = prefix << 8 | k
+            code = codes.get(key)
+            if code is not None:
+                prefix = code
+                continue
+            bits |= prefix << count
+            count += size
+            if next_code == 4096:
+                # the table is full: start over
+                bits |= clear << count
+                count += size
+                codes = {}
+                next_code = clear + 2
+                size = min_size + 1
+            else:
+                codes[key] = next_code
+                if next_code == 1 << size:
+                    size += 1
+                next_code += 1
+            while count >= 8:
+                out.append(bits & 0xFF)
+                bits >>= 8
+                count -= 8
+            prefix = k
+        bits |= prefix << count
+        count += size
+        if next_code == 1 << size and size < 12:
+            size += 1
+        bits |= (clear + 1) << count
+        count += size
+        while count > 0:
+            out.append(bits & 0xFF)
+            bits >>= 8
+            count -= 8
+        return out
+
+    ###########################################################################
+    # Tracing
+
+    # what is timed: public calls, then the phases they are made of
+    _TRACED = (
+        "forward",
+        "backward",
+        "goto",
+        "left",
+        "right",
+        "setheading",
+        "circle",
+        "dot",
+        "stamp",
+        "clear",
+        "bgcolor",
+        "write",
+        "path",
+        "draw_segments",
+        "_do_draw_line",
+        "_raster_line",
+        "_do_turn",
+        "_drawturtle",
+        "_sleep",
+    )
+
+    def start_trace(self, size: int = 4096) -> None:
+        """
+        Start timing drawing calls and their phases (line rasterizing, turns,
+        sprite updates and animation sleeps). The last size timings are kept
+        in a ring buffer allocated here, so tracing can be left on; save
+        them with save_trace(). Untraced calls cost nothing extra.
+
+        :param size: how many timings to keep
+
+        """
+        import threading
+
+        self.stop_trace()
+        names = self._TRACED
+        self._trace_names = names
+        self._trace_size = size
+        self._trace_count = 0
+        self._trace_what = bytearray(size)
+        self._trace_thread = bytearray(size)
+        self._trace_start = array.array("q", bytes(8 * size))
+        self._trace_end = array.array("q", bytes(8 * size))
+        self._trace_threads = {}
+        # the render worker records timings, too
+        self._trace_lock = threading.Lock()
+        for what, name in enumerate(names):
+            setattr(self, name, self._traced(what, getattr(self, name), threading.get_ident))
+
+    def _traced(self, what: int, method, get_ident):
+        clock = time.monotonic_ns
+        threads = self._trace_threads
+        lock = self._trace_lock
+
+        def traced(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                end = clock()
+                thread = get_ident()
+                with lock:
+                    i = self._trace_count % self._trace_size
+                    self._trace_count += 1
+                    self._trace_what[i] = what
+                    self._trace_start[i] = start
+                    self._trace_end[i] = end
+                    if thread not in threads:
+                        threads[thread] = len(threads) % 256
+                    self._trace_thread[i] = threads[thread]
+
+        return traced
+
+    def stop_trace(self) -> None:
+        """
+        Stop timing drawing calls. The timings taken so far can still be saved."""
+        if self._trace_names is None:
+            return
+        for name in self._trace_names:
+            if name in self.__dict__:
+                delattr(self, name)
+
+    def save_trace(self, file: Union[str, BinaryIO]) -> None:
+        """
+        Write the timings taken since start_trace() as Chrome trace event JSON,
+        which chrome://tracing and Perfetto can show.
+
+        :param file: a path, or a stream opened for binary writing
+
+        """
+        if self._trace_names is None:
+            raise RuntimeError("No trace was taken")
+        if isinstance(file, str):
+            with open(file, "wb") as stream:
+                self._save_trace(stream)
+        else:
+            self._save_trace(file)
+
+    def _save_trace(self, stream: BinaryIO) -> None:
+        count = min(self._trace_count, self._trace_size)
+        first = self._trace_count - count
+        stream.write(b'{"traceEvents":[')
+        for n in range(first, self._trace_count):
+            i = n % self._trace_size
+            start = self._trace_start[i]
+            event = (
+                f'{{"name":"{self._trace_names[self._trace_what[i]]}","ph":"X","pid":1,'
+                f'"tid":{self._trace_thread[i]},"ts":{start / 1000},'
+                f'"dur":{(self._trace_end[i] - start) / 1000}}}'
+            )
+            stream.write((event if n == first else "," + event).encode())
+        stream.write(b"]}")
+
+    ###########################################################################
+    # Spatial index
+
+    def spatialindex(self, cell: Optional[int] = 16) -> None:
+        """
+        Keep an index of the lines and dots drawn from now on, to ask what
+        has been drawn where with hits(), nearest() and region() without
+        reading the canvas pixel by pixel. The canvas is divided into square
+        cells, and every line is listed in the cells it passes through, so a
+        query only looks at what is drawn near it. Only what is drawn on the
+        canvas is indexed. clear() empties the index and undo() takes back
+        what it holds, too.
+
+        :param cell: the side of a cell in pixels, or None to stop indexing
+
+        """
+        if cell is None or cell < 1:
+            self._index = None
+            return
+        self._index = _SpatialIndex(cell, self._w, self._h)
+
+    def _spatial_index(self) -> _SpatialIndex:
+        if self._index is None:
+            raise RuntimeError("No spatial index, see spatialindex()")
+        self.flush()
+        return self._index
+
+    def _from_canvas(self, item: tuple) -> tuple:
+        """An index item as (x0, y0, x1, y1) in turtle coordinates"""
+        cx = self._w // 2
+        cy = self._h // 2
+        return (item[0] - cx, cy - item[1], item[2] - cx, cy - item[3])
+
+    def hits(self, x0: float, y0: float, x1: float, y1: float) -> List[tuple]:
+        """
+        Return the lines and dots drawn that a line from (x0, y0) to (x1, y1)
+        would cross or touch, in the order they were drawn. Each is given as
+        its ends (x0, y0, x1, y1); a dot has both ends at its center. The
+        line the turtle drew last ends where the turtle is, so it is among
+        the hits of a line starting there.
+
+        :param x0: where the line starts
+        :param y0: where the line starts
+        :param x1: where the line ends
+        :param y1: where the line ends
+
+        """
+        index = self._spatial_index()
+        cx = self._w // 2
+        cy = self._h // 2
+        # only the canvas has anything drawn on it
+        line = index.clip(
+            x0 + cx, cy - y0, x1 + cx, cy - y1, -0.5, -0.5, self._w - 0.5, self._h - 0.5
+        )
+        if line is None:
+            return []
+        return [
+            self._from_canvas(item)
+            for item in index.candidates(index.reach(line, 0.5))
+            if index.apart(line, item) < item[4] + 0.5
+        ]
+
+    def nearest(self, x: float, y: float) -> Optional[Tuple[tuple, float]]:
+        """
+        Return the line or dot drawn closest to the point (x, y), as its ends
+        (x0, y0, x1, y1), and how far its edge is from the point (0 if the
+        point is on it). Return None if nothing has been drawn.
+
+        :param x: the x coordinate of the point
+        :param y: the y coordinate of the point
+
+        """
+        index = self._spatial_index()
+        px = x + self._w // 2
+        py = self._h // 2 - y
+        cell = index.cell
+        column = math.floor(px / cell)
+        row = math.floor(py / cell)
+        # the ring of cells around the point's cell that reaches the far corner
+        last = max(abs(column), abs(index.columns - column), abs(row), abs(index.rows - row))
+        best = None
+        best_distance = 0
+        seen = set()
+        for ring in range(last + 1):
+            for i in range(-ring, ring + 1):
+                for key in (
+                    (column + i, row - ring),
+                    (column + i, row + ring),
+                    (column - ring, row + i),
+                    (column + ring, row + i),
+                ):
+                    for n in index.cells.get(key, ()):
+                        if n in seen:
+                            continue
+                        seen.add(n)
+                        item = index.items[n]
+                        distance = max(0, index.distance(px, py, *item[:4]) - item[4])
+                        if best is None or distance < best_distance:
+                            best = item
+                            best_distance = distance
+            # nothing in the cells further out is closer than this
+            if best is not None and best_distance <= ring * cell:
+                break
+        if best is None:
+            return None
+        return self._from_canvas(best), best_distance
+
+    def region(self, x0: float, y0: float, x1: float, y1: float) -> List[tuple]:
+        """
+        Return the lines and dots drawn that reach into the rectangle with
+        corners (x0, y0) and (x1, y1), in the order they were drawn, each as
+        its ends (x0, y0, x1, y1).
+
+        :param x0: one corner of the rectangle
+        :param y0: one corner of the rectangle
+        :param x1: the opposite corner
+        :param y1: the opposite corner
+
+        """
+        index = self._spatial_index()
+        cx = self._w // 2
+        cy = self._h // 2
+        # only the canvas has anything drawn on it
+        left = max(0, min(x0, x1) + cx)
+        right = min(self._w - 1, max(x0, x1) + cx)
+        top = max(0, cy - max(y0, y1))
+        bottom = min(self._h - 1, cy - min(y0, y1))
+        if left > right or top > bottom:
+            return []
+        cell = index.cell
+        keys = [
+            (column, row)
+            for column in range(math.floor(left / cell), math.floor(right / cell) + 1)
+            for row in range(math.floor(top / cell), math.floor(bottom / cell) + 1)
+        ]
+        return [
+            self._from_canvas(item)
+            for item in index.candidates(keys)
+            if index.clip(
+                *item[:4], left - item[4], top - item[4], right + item[4], bottom + item[4]
+            )
+        ]
+
+
+class CommandEncoder:
+    """Encodes turtle commands in a compact binary form, to be sent over a
+    serial link, pipe or socket and carried out by `adafruit_turtle.turtle.receive`.
+
+    Each command is an opcode byte followed by its arguments as zig-zag
+    varints. Positions are whole units, sent as the difference from the
+    previous goto(); angles are in hundredths of a degree. A turn by the
+    same angle as the turn just before it is folded into a repeat count.
+    The methods are named like the turtle's, so drawing code can be run
+    with either.
+    """
+
+    END = adafruit_turtle._OP_END
+    GOTO = adafruit_turtle._OP_GOTO
+    FORWARD = adafruit_turtle._OP_FORWARD
+    LEFT = adafruit_turtle._OP_LEFT
+    AGAIN = adafruit_turtle._OP_AGAIN
+    PENUP = adafruit_turtle._OP_PENUP
+    PENDOWN = adafruit_turtle._OP_PENDOWN
+    PENSIZE = adafruit_turtle._OP_PENSIZE
+    PENCOLOR = adafruit_turtle._OP_PENCOLOR
+    SETHEADING = adafruit_turtle._OP_SETHEADING
+    DOT = adafruit_turtle._OP_DOT
+    CLEAR = adafruit_turtle._OP_CLEAR
+    CIRCLE = adafruit_turtle._OP_CIRCLE
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+        self._x = 0
+        self._y = 0
+        self._angle = None
+        self._again = 0
+
+    def take(self) -> bytearray:
+        """Return the commands encoded so far and start anew. Positions stay
+        relative to the last goto(), so the chunks must be carried out in
+        order by one turtle."""
+        self._flush_turns()
+        # a repeat count must not start the next chunk
+        self._angle = None
+        data = self.data
+        self.data = bytearray()
+        return data
+
+    def _command(self, opcode: int, *args: int) -> None:
+        self._flush_turns()
+        self._angle = None
+        data = self.data
+        data.append(opcode)
+        for arg in args:
+            value = (arg << 1) ^ (arg >> 63)
+            while value > 0x7F:
+                data.append(value & 0x7F | 0x80)
+                value >>= 7
+            data.append(value)
+
+    def _flush_turns(self) -> None:
+        if self._again:
+            again = self._again
+            self._again = 0
+            self._command(self.AGAIN, again)
+
+    def goto(self, x: float, y: float) -> None:
+        """Encode a goto(x, y), rounded to whole units"""
+        x = round(x)
+        y = round(y)
+        self._command(self.GOTO, x - self._x, y - self._y)
+        self._x = x
+        self._y = y
+
+    def forward(self, distance: float) -> None:
+        """Encode a forward(distance), rounded to whole units"""
+        self._command(self.FORWARD, round(distance))
+
+    def backward(self, distance: float) -> None:
+        """Encode a backward(distance), as a forward(-distance)"""
+        self.forward(-distance)
+
+    def left(self, angle: float) -> None:
+        """Encode a left(angle), or count a repeat of the turn just before"""
+        angle = round(angle * 100)
+        if angle == self._angle:
+            self._again += 1
+            return
+        self._command(self.LEFT, angle)
+        self._angle = angle
+
+    def right(self, angle: float) -> None:
+        """Encode a right(angle), as a left(-angle)"""
+        self.left(-angle)
+
+    def penup(self) -> None:
+        """Encode a penup()"""
+        self._command(self.PENUP)
+
+    def pendown(self) -> None:
+        """Encode a pendown()"""
+        self._command(self.PENDOWN)
+
+    def pensize(self, width: int) -> None:
+        """Encode a pensize(width)"""
+        self._command(self.PENSIZE, width)
+
+    def pencolor(self, c: int) -> None:
+        """Encode a pencolor(c), c being a 0xRRGGBB color"""
+        self._command(self.PENCOLOR, c)
+
+    def setheading(self, to_angle: float) -> None:
+        """Encode a setheading(to_angle), to a hundredth of a degree"""
+        self._command(self.SETHEADING, round(to_angle * 100))
+
+    def dot(self, size: int) -> None:
+        """Encode a dot(size) in the pen color"""
+        self._command(self.DOT, size)
+
+    def clear(self) -> None:
+        """Encode a clear()"""
+        self._command(self.CLEAR)
+
+    def circle(self, radius: float, extent: float = 360) -> None:
+        """Encode a circle(radius, extent), the radius in whole units"""
+        self._command(self.CIRCLE, round(radius), round(extent * 100))
+
+    def end(self) -> None:
+        """Make `adafruit_turtle.turtle.receive` return"""
+        self._command(self.END)
+
+
+class _RenderQueue:
+    """The bounded queue of raster commands the render worker carries out.
+    The first error a command raises is kept, and raised on the drawing side
+    by the next put() or join(); commands queued before it is raised are
+    dropped, as they would not have been drawn without the worker either."""
+
+    def __init__(self, size: int) -> None:
+        import queue
+
+        self.commands = queue.Queue(size)
+        self.error = None
+
+    def put(self, command: tuple) -> None:
+        self.raise_error()
+        self.commands.put(command)
+
+    def join(self) -> None:
+        self.commands.join()
+        self.raise_error()
+
+    def stop(self) -> None:
+        """Make work() return once the commands queued so far are done"""
+        self.commands.put(None)
+
+    def raise_error(self) -> None:
+        error = self.error
+        if error is not None:
+            self.error = None
+            raise error
+
+    def work(self) -> None:
+        commands = self.commands
+        while True:
+            command = commands.get()
+            try:
+                if command is None:
+                    return
+                if self.error is None:
+                    command[0](*command[1])
+            except Exception as err:
+                self.error = err
+            finally:
+                commands.task_done()
+
+
+class _DirtyTracker:
+    """Stands in for the canvas while frames are captured, writing through
+    and growing the box (x0, y0, x1, y1) around the pixels written"""
+
+    def __init__(self, canvas, box: list) -> None:
+        self.canvas = canvas
+        self.box = box
+
+    def __getitem__(self, index: Tuple[int, int]) -> int:
+        return self.canvas[index]
+
+    def __setitem__(self, index: Tuple[int, int], value: int) -> None:
+        self.canvas[index] = value
+        x, y = index
+        box = self.box
+        box[0] = min(box[0], x)
+        box[1] = min(box[1], y)
+        box[2] = max(box[2], x)
+        box[3] = max(box[3], y)
+
+
+class _CommandLog:
+    """Stands in for the render queue, keeping the raster commands to be
+    rendered later by render_parallel()"""
+
+    def __init__(self) -> None:
+        self.commands = []
+
+    def put(self, command: tuple) -> None:
+        # the arguments of _raster_line (8) or _plot_pen (6)
+        self.commands.append(command[1])
+
+    def join(self) -> None:
+        # nothing recorded is on the canvas before render_parallel()
+        raise RuntimeError("Not while recording; call render_parallel() first")
+
+
+class _SpatialIndex:
+    """A uniform grid over the canvas of the lines and dots drawn, each kept
+    as (x0, y0, x1, y1, half the pen size) in canvas pixels; a dot is a line
+    with both ends in one place"""
+
+    def __init__(self, cell: int, width: int, height: int) -> None:
+        self.cell = cell
+        # the last grid column and row on the canvas
+        self.columns = (width - 1) // cell
+        self.rows = (height - 1) // cell
+        self.items = []
+        # the items reaching into each cell, by (column, row), oldest first
+        self.cells = {}
+
+    def add(self, item: tuple) -> None:
+        n = len(self.items)
+        self.items.append(item)
+        cells = self.cells
+        for key in self.reach(item, item[4]):
+            if key in cells:
+                cells[key].append(n)
+            else:
+                cells[key] = [n]
+
+    def truncate(self, count: int) -> None:
+        """Forget the items added after the first count"""
+        items = self.items
+        cells = self.cells
+        while len(items) > count:
+            item = items.pop()
+            for key in self.reach(item, item[4]):
+                ids = cells[key]
+                ids.pop()
+                if not ids:
+                    del cells[key]
+
+    def clear(self) -> None:
+        self.items = []
+        self.cells = {}
+
+    def reach(self, line: tuple, r: float):
+        """The grid cells on the canvas that line, r pixels wide on either
+        side, reaches into"""
+        x0, y0, x1, y1 = line[:4]
+        cell = self.cell
+        for column in range(
+            max(0, math.floor((min(x0, x1) - r) / cell)),
+            min(self.columns, math.floor((max(x0, x1) + r) / cell)) + 1,
+        ):
+            left = column * cell - r
+            for row in range(
+                max(0, math.floor((min(y0, y1) - r) / cell)),
+                min(self.rows, math.floor((max(y0, y1) + r) / cell)) + 1,
+            ):
+                top = row * cell - r
+                if self.clip(x0, y0, x1, y1, left, top, left + cell + 2 * r, top + cell + 2 * r):
+                    yield (column, row)
+
+    def candidates(self, keys) -> list:
+        """The items in the given cells, in the order they were drawn"""
+        ids = set()
+        for key in keys:
+            ids.update(self.cells.get(key, ()))
+        return [self.items[i] for i in sorted(ids)]
+
+    @staticmethod
+    def clip(x0, y0, x1, y1, left, top, right, bottom) -> Optional[tuple]:
+        """The part of the line from (x0, y0) to (x1, y1) inside the rectangle,
+        or None if it does not reach into it"""
+        t0 = 0
+        t1 = 1
+        dx = x1 - x0
+        dy = y1 - y0
+        for p, q in ((-dx, x0 - left), (dx, right - x0), (-dy, y0 - top), (dy, bottom - y0)):
+            if p == 0:
+                if q < 0:
+                    return None
+                continue
+            t = q / p
+            if p < 0:
+                if t > t1:
+                    return None
+                t0 = max(t0, t)
+            else:
+                if t < t0:
+                    return None
+                t1 = min(t1, t)
+        return (x0 + t0 * dx, y0 + t0 * dy, x0 + t1 * dx, y0 + t1 * dy)
+
+    @staticmethod
+    def distance(px, py, x0, y0, x1, y1) -> float:
+        """How far the point (px, py) is from the line from (x0, y0) to (x1, y1)"""
+        dx = x1 - x0
+        dy = y1 - y0
+        length = dx * dx + dy * dy
+        t = 0 if length == 0 else max(0, min(1, ((px - x0) * dx + (py - y0) * dy) / length))
+        return math.sqrt((px - x0 - t * dx) ** 2 + (py - y0 - t * dy) ** 2)
+
+    @classmethod
+    def apart(cls, a: tuple, b: tuple) -> float:
+        """How far apart the center lines of two items are"""
+        ax0, ay0, ax1, ay1 = a[:4]
+        bx0, by0, bx1, by1 = b[:4]
+        d1 = (bx1 - bx0) * (ay0 - by0) - (by1 - by0) * (ax0 - bx0)
+        d2 = (bx1 - bx0) * (ay1 - by0) - (by1 - by0) * (ax1 - bx0)
+        d3 = (ax1 - ax0) * (by0 - ay0) - (ay1 - ay0) * (bx0 - ax0)
+        d4 = (ax1 - ax0) * (by1 - ay0) - (ay1 - ay0) * (bx1 - ax0)
+        if d1 * d2 < 0 and d3 * d4 < 0:
+            return 0
+        return min(
+            cls.distance(ax0, ay0, bx0, by0, bx1, by1),
+            cls.distance(ax1, ay1, bx0, by0, bx1, by1),
+            cls.distance(bx0, by0, ax0, ay0, ax1, ay1),
+            cls.distance(bx1, by1, ax0, ay0, ax1, ay1),
+        )
+
+
+class _BandRaster:
+    """Rasterizes like a turtle in a render process, into one band of rows
+    of a shared memory canvas with one byte per pixel"""
+
+    def __init__(self, buffer, width: int, height: int, top: int, bottom: int, clips: bool) -> None:
+        self.buffer = buffer
+        self.width = width
+        self.height = height
+        self.top = top
+        self.bottom = bottom
+        self.clips = clips
+        self._canvas = self
+        # _plot_pen() writes every pixel of a band
+        self._skip_unchanged = False
+
+    def __setitem__(self, index: Tuple[int, int], value: int) -> None:
+        x, y = index
+        if 0 <= x < self.width and 0 <= y < self.height:
+            if self.top <= y < self.bottom:
+                self.buffer[y * self.width + x] = value
+        elif not self.clips:
+            raise IndexError("pixel outside the canvas")
+
+    def _plot_pen(self, *args) -> None:
+        adafruit_turtle.turtle._plot_pen(self, *args)
+
+    def _raster_line(
+        self, x0: int, y0: int, xn: int, yn: int, c: int, size: int, angle: float, slant: bool
+    ) -> None:
+        """The Bresenham walk of turtle._raster_line, limited to the steps
+        whose pen can reach the rows of this band"""
+        steep = abs(yn - y0) > abs(xn - x0)
+        if steep:
+            x0, y0 = y0, x0
+            xn, yn = yn, xn
+        dx = abs(xn - x0)
+        dy = abs(yn - y0)
+        xstep = -1 if x0 > xn else 1
+        ystep = 1 if y0 < yn else -1
+        # the rows the pen nib reaches from, as in render_parallel()
+        low = self.top - size - 2
+        high = self.bottom - 1 + size + 2
+        if steep:
+            # the row is the major coordinate, x0 + xstep * step
+            first, last = sorted(((low - x0) * xstep, (high - x0) * xstep))
+        else:
+            # the row is y0 + ystep * drops, err dropping below zero once
+            # every dx / dy steps
+            first, last = sorted(((low - y0) * ystep, (high - y0) * ystep))
+            first = self._steps_to(first, dx, dy)
+            last = self._steps_to(last + 1, dx, dy) - 1
+        first = max(first, 0)
+        last = min(last, dx)
+        if first > last:
+            return
+        drops = -((dx // 2 - first * dy) // dx) if dx else 0
+        err = dx // 2 - first * dy + drops * dx
+        x0 += xstep * first
+        y0 += ystep * drops
+        plot = self._plot_pen
+        for _ in range(last - first + 1):
+            if steep:
+                plot(y0, x0, c, size, angle, slant)
+            else:
+                plot(x0, y0, c, size, angle, slant)
+            err -= dy
+            if err < 0:
+                y0 += ystep
+                err += dx
+            x0 += xstep
+
+    @staticmethod
+    def _steps_to(drops: int, dx: int, dy: int) -> int:
+        """The first step of the walk at which err has dropped below zero
+        drops times"""
+        if drops <= 0:
+            return 0
+        if dy == 0:
+            return dx + 1
+        return ((drops - 1) * dx + dx // 2) // dy + 1
+
+
+def _render_band(task: tuple) -> None:
+    """Rasterize the commands of one band in a render process"""
+    from multiprocessing import shared_memory
+
+    name, width, height, top, bottom, clips, commands = task
+    memory = shared_memory.SharedMemory(name=name)
+    try:
+        raster = _BandRaster(memory.buf, width, height, top, bottom, clips)
+        for command in commands:
+            if len(command) == 8:
+                raster._raster_line(*command)
+            else:
+                raster._plot_pen(*command)
+        raster.buffer = None
+    finally:
+        memory.close()
@@ -0,0 +1,118 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_turtle_lsystem`
+================================================================================
+
+Lindenmayer systems drawn with an `adafruit_turtle.turtle`, kept in their own
+module so that `adafruit_turtle` stays small.
+
+Implementation Notes
+--------------------
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://github.com/adafruit/circuitpython/releases
+"""
+
+from __future__ import annotations
+
+try:
+    from typing import Iterator
+
+    from adafruit_turtle import turtle
+except ImportError:
+    pass
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_turtle.git"
+
+
+class LSystem:
+    """A Lindenmayer system that draws with a turtle.
+
+    The axiom is rewritten ``generations`` times with the rules, lazily and
+    without recursion: only one symbol of each generation is held at a time,
+    so deep generations need no more memory than shallow ones.
+
+    When drawing, the symbols in ``forward`` move forward by ``step`` with the
+    pen down, the symbols in ``move`` move forward with the pen up, ``+``
+    turns left and ``-`` turns right by ``angle``, ``[`` saves the turtle's
+    position, heading and pen with push() and ``]`` goes back to them with
+    pop(). Any other symbol is only used for rewriting.
+
+    :param axiom: the starting string
+    :param rules: a dict mapping a symbol to the string that replaces it
+    :param angle: how far ``+`` and ``-`` turn
+    :param step: how far the drawing symbols move
+    :param forward: the symbols that draw a line
+    :param move: the symbols that move without drawing
+    """
+
+    def __init__(
+        self,
+        axiom: str,
+        rules: dict,
+        angle: float,
+        step: float = 10,
+        forward: str = "FG",
+        move: str = "f",
+    ) -> None:
+        self.axiom = axiom
+        self.rules = rules
+        self.angle = angle
+        self.step = step
+        self.forward = forward
+        self.move = move
+
+    def expand(self, generations: int) -> Iterator[str]:
+        """Yield the symbols of the given generation one by one.
+
+        :param generations: how many times to apply the rules
+        """
+        rules = self.rules
+        texts = [self.axiom] + [""] * generations
+        index = [0] * (generations + 1)
+        level = 0
+        while level >= 0:
+            text = texts[level]
+            i = index[level]
+            if i == len(text):
+                level -= 1
+                continue
+            index[level] = i + 1
+            symbol = text[i]
+            if level < generations and symbol in rules:
+                level += 1
+                texts[level] = rules[symbol]
+                index[level] = 0
+            else:
+                yield symbol
+
+    def draw(self, t: turtle, generations: int) -> None:
+        """Draw the given generation with turtle t, starting from its
+        current position and heading.
+
+        :param t: the turtle to draw with
+        :param generations: how many times to apply the rules
+        """
+        for symbol in self.expand(generations):
+            if symbol in self.forward:
+                t.forward(self.step)
+            elif symbol == "+":
+                t.left(self.angle)
+            elif symbol == "-":
+                t.right(self.angle)
+            elif symbol in self.move:
+                down = t.isdown()
+                t.penup()
+                t.forward(self.step)
+                if down:
+                    t.pendown()
+            elif symbol == "[":
+                t.push()
+            elif symbol == "]":
+                t.pop()
@@ -0,0 +1,23 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+# SPDX-License-Identifier: MIT
+
+import board
+
+from adafruit_turtle import turtle
+from adafruit_turtle_lsystem import LSystem
+
+turtle = turtle(board.DISPLAY)
+
+unit = min(board.DISPLAY.width / 3, board.DISPLAY.height / 4)
+num_generations = 3
+
+# Koch snowflake: the same drawing as turtle_koch.py, without recursion
+koch = LSystem("F--F--F", {"F": "F+F--F+F"}, angle=60, step=unit * 3 / 3**num_generations)
+
+turtle.penup()
+turtle.goto(-1.5 * unit, unit)
+turtle.pendown()
+koch.draw(turtle, num_generations)
+
+while True:
+    pass
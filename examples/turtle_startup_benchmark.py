@@ -0,0 +1,28 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+# SPDX-License-Identifier: MIT
+
+# Measure how long it takes from boot to the first stroke on screen
+
+from supervisor import ticks_ms
+
+start = ticks_ms()
+
+import board
+
+from adafruit_turtle import turtle
+
+imported = ticks_ms()
+turtle = turtle(board.DISPLAY)
+constructed = ticks_ms()
+turtle.speed(0)
+turtle.pendown()
+turtle.forward(1)
+drawn = ticks_ms()
+
+# ticks_ms() wraps around at 2**29
+print(f"import:       {(imported - start) & 0x1FFFFFFF} ms")
+print(f"construction: {(constructed - imported) & 0x1FFFFFFF} ms")
+print(f"first stroke: {(drawn - constructed) & 0x1FFFFFFF} ms")
+
+while True:
+    pass
@@ -0,0 +1,19 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+
+class Display:
+    """Just enough of a display for the turtle to draw on"""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.root_group = None
+
+
+@pytest.fixture
+def display():
+    return Display(64, 48)
@@ -0,0 +1,17 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+from adafruit_turtle import turtle
+
+
+def test_auto_scale_reports_the_canvas_it_picked(display, capsys):
+    t = turtle(display, scale="auto", memory=1024, headroom=0)
+    width, height, scale, bit_depth = t.canvas_config
+    assert (width, height) == (display.width // scale, display.height // scale)
+    assert (width * bit_depth + 31) // 32 * 4 * height <= 1024
+    assert not capsys.readouterr().out
+
+
+def test_fixed_scale(display):
+    assert turtle(display, scale=2, bit_depth=2).canvas_config == (32, 24, 2, 2)
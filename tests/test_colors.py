@@ -0,0 +1,23 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from adafruit_turtle import Color, turtle
+
+
+@pytest.mark.parametrize("bit_depth", [1, 2])
+def test_pen_colors_never_become_the_background(display, bit_depth):
+    t = turtle(display, bit_depth=bit_depth)
+    for background in (Color.BLACK, Color.WHITE):
+        t.bgcolor(background)
+        for c in Color.colors:
+            if c != background:
+                assert t.pencolor(c) != background
+
+
+def test_background_colors_are_quantised_to_the_nearest(display):
+    t = turtle(display, bit_depth=1)
+    assert t.bgcolor(Color.DARK_BLUE) == Color.BLACK
+    assert t.bgcolor(Color.LIGHT_GRAY) == Color.WHITE
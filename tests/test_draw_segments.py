@@ -0,0 +1,32 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+import random
+
+import pytest
+
+import adafruit_turtle
+import adafruit_turtle_host
+
+pytest.importorskip("numpy")
+
+
+def pixels(t):
+    return [t._fg_bitmap[x, y] for y in range(t._h) for x in range(t._w)]
+
+
+@pytest.mark.parametrize("make", [list, iter, lambda s: (segment for segment in s)])
+def test_numpy_draws_any_iterable_like_the_core(display, make):
+    rng = random.Random(5)
+    segments = [
+        (rng.uniform(-40, 40), rng.uniform(-30, 30), rng.uniform(-40, 40), rng.uniform(-30, 30))
+        for _ in range(30)
+    ]
+    core = adafruit_turtle.turtle(display)
+    core.pensize(3)
+    core.draw_segments(segments)
+    host = adafruit_turtle_host.turtle(display)
+    host.pensize(3)
+    host.draw_segments(make(segments))
+    assert pixels(host) == pixels(core)
@@ -0,0 +1,40 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+import random
+
+from adafruit_turtle import turtle
+
+
+def draw(display, seed):
+    rng = random.Random(seed)
+    t = turtle(display)
+    t.speed(0)
+    t.fixedpoint()
+    t.pendown()
+    for _ in range(40):
+        t.forward(rng.choice((rng.randint(-30, 30), rng.uniform(-30, 30))))
+        t.left(rng.uniform(-180, 180))
+    pixels = [t._fg_bitmap[x, y] for y in range(t._h) for x in range(t._w)]
+    return tuple(t.pos()), t.heading(), pixels
+
+
+def test_the_same_commands_end_in_the_same_place(display):
+    for seed in range(5):
+        assert draw(display, seed) == draw(display, seed)
+
+
+def test_a_reset_turtle_draws_the_same_again(display):
+    t = turtle(display)
+    t.speed(0)
+    t.fixedpoint()
+    ends = []
+    for _ in range(2):
+        t.reset()
+        t.pendown()
+        for _ in range(20):
+            t.forward(37.3)
+            t.left(101.7)
+        ends.append((tuple(t.pos()), t.heading()))
+    assert ends[1] == ends[0]
@@ -0,0 +1,40 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+import adafruit_turtle
+from adafruit_turtle_lsystem import LSystem
+
+
+def rewrite(axiom, rules, generations):
+    text = axiom
+    for _ in range(generations):
+        text = "".join(rules.get(symbol, symbol) for symbol in text)
+    return text
+
+
+@pytest.mark.parametrize(
+    ("axiom", "rules"),
+    [
+        ("F--F--F", {"F": "F+F--F+F"}),
+        ("X", {"X": "F+[[X]-X]-F[-FX]+X", "F": "FF"}),
+        ("A", {"A": "AB", "B": "A"}),
+        ("F", {}),
+    ],
+)
+@pytest.mark.parametrize("generations", [0, 1, 2, 4])
+def test_expand_rewrites_like_strings(axiom, rules, generations):
+    expanded = "".join(LSystem(axiom, rules, angle=90).expand(generations))
+    assert expanded == rewrite(axiom, rules, generations)
+
+
+def test_brackets_restore_the_pose(display):
+    t = adafruit_turtle.turtle(display)
+    t.speed(0)
+    t.pendown()
+    LSystem("F[+F[-fF]F]F", {}, angle=30, step=10).draw(t, 0)
+    assert tuple(t.pos()) == (20, 0)
+    assert t.heading() == 0
+    assert t.isdown()
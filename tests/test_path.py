@@ -0,0 +1,40 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+import array
+import random
+
+import pytest
+
+from adafruit_turtle import turtle
+
+
+def pixels(t):
+    return [t._fg_bitmap[x, y] for y in range(t._h) for x in range(t._w)]
+
+
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize("flat", [False, True])
+def test_path_draws_like_a_goto_per_point(display, seed, flat):
+    rng = random.Random(seed)
+    # past the edges of the canvas, too
+    points = [(rng.uniform(-50, 50), rng.uniform(-40, 40)) for _ in range(12)]
+    size = rng.randint(1, 6)
+    heading = rng.uniform(0, 360)
+    drawn = []
+    for use_path in (False, True):
+        t = turtle(display)
+        t.speed(0)
+        t.setheading(heading)
+        t.pensize(size)
+        t.pendown()
+        if not use_path:
+            for x, y in points:
+                t.goto(x, y)
+        elif flat:
+            t.path(array.array("d", [v for point in points for v in point]))
+        else:
+            t.path(points)
+        drawn.append((pixels(t), tuple(t.pos())))
+    assert drawn[1] == drawn[0]
@@ -0,0 +1,38 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from adafruit_turtle import Color, turtle
+
+
+def test_pop_without_push_raises(display):
+    t = turtle(display)
+    with pytest.raises(IndexError):
+        t.pop()
+    t.push()
+    t.pop()
+    with pytest.raises(IndexError):
+        t.pop()
+
+
+def test_pop_goes_back_without_drawing(display):
+    t = turtle(display)
+    t.speed(0)
+    t.push()
+    t.pendown()
+    t.pensize(4)
+    t.pencolor(Color.RED)
+    t.left(30)
+    t.forward(20)
+    pixels = [t._fg_bitmap[x, y] for y in range(t._h) for x in range(t._w)]
+    t.pop()
+    assert (tuple(t.pos()), t.heading(), t.isdown(), t.pensize(), t.pencolor()) == (
+        (0, 0),
+        0,
+        False,
+        1,
+        Color.WHITE,
+    )
+    assert [t._fg_bitmap[x, y] for y in range(t._h) for x in range(t._w)] == pixels
@@ -0,0 +1,45 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+import io
+
+import adafruit_turtle
+import adafruit_turtle_host
+
+
+def test_chunks_received_one_at_a_time(display):
+    encoder = adafruit_turtle_host.CommandEncoder()
+    t = adafruit_turtle.turtle(display)
+    t.speed(0)
+    encoder.goto(10, 5)
+    encoder.left(90)
+    t.receive(io.BytesIO(encoder.take()))
+    encoder.left(90)
+    encoder.goto(20, 15)
+    t.receive(io.BytesIO(encoder.take()))
+    assert t.heading() == 180
+    assert tuple(t.pos()) == (20, 15)
+
+
+def test_take_ends_a_run_of_turns():
+    encoder = adafruit_turtle_host.CommandEncoder()
+    encoder.left(45)
+    encoder.take()
+    encoder.left(45)
+    assert encoder.take()[0] == adafruit_turtle_host.CommandEncoder.LEFT
+
+
+def test_commands_read_past_end_are_carried_out_next(display):
+    encoder = adafruit_turtle_host.CommandEncoder()
+    t = adafruit_turtle.turtle(display)
+    t.speed(0)
+    encoder.goto(10, 5)
+    encoder.end()
+    encoder.goto(20, 15)
+    encoder.end()
+    stream = io.BytesIO(encoder.take())
+    t.receive(stream)
+    assert tuple(t.pos()) == (10, 5)
+    t.receive(stream)
+    assert tuple(t.pos()) == (20, 15)
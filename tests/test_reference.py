@@ -0,0 +1,182 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+# Check that the turtle still draws exactly the same pixels as when the
+# reference hashes were recorded: random drawings are made on a stand-in
+# display and the hash of each canvas is compared with reference_hashes.json.
+# Every fast path must draw the same pixels as plain drawing, except
+# fixedpoint, which rounds differently and has hashes of its own.
+#
+# TURTLE_REFERENCE_COUNT sets how many drawings each mode makes (default 40,
+# at most 300). To record the hashes again after an intended change:
+#
+#   PYTHONPATH=. python tests/test_reference.py --update
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import random
+
+import pytest
+
+import adafruit_turtle
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+HASHES = os.path.join(HERE, "reference_hashes.json")
+FIXEDPOINT_HASHES = os.path.join(HERE, "reference_hashes_fixedpoint.json")
+COUNT = int(os.environ.get("TURTLE_REFERENCE_COUNT", "40"))
+
+MODES = (
+    "direct",
+    "path",
+    "draw_segments",
+    "worker",
+    "segmentcache",
+    "skipunchanged",
+    "parallel",
+    "fixedpoint",
+)
+
+
+class Display:
+    """Just enough of a display for the turtle to draw on"""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.root_group = None
+
+
+def commands(seed):
+    """The drawing commands of one reference drawing"""
+    rng = random.Random(seed)
+    result = [("speed", (rng.choice((0, 0, 0, 10)),))]
+    if rng.random() < 0.3:
+        result.append(("mode", ("logo",)))
+    radians = rng.random() < 0.3
+    if radians:
+        result.append(("radians", ()))
+    full = 6.283185307179586 if radians else 360.0
+    result.append(("pendown", ()))
+    for _ in range(rng.randint(5, 25)):
+        kind = rng.random()
+        if kind < 0.3:
+            result.append(("forward", (rng.uniform(-120, 120),)))
+        elif kind < 0.45:
+            result.append((rng.choice(("left", "right")), (rng.uniform(-full, full),)))
+        elif kind < 0.55:
+            result.append(("pensize", (rng.randint(1, 20),)))
+        elif kind < 0.62:
+            result.append(("pencolor", (rng.choice(adafruit_turtle.Color.colors[1:]),)))
+        elif kind < 0.72:
+            # well past the edges of the canvas, too
+            result.append(("goto", (rng.uniform(-200, 200), rng.uniform(-160, 160))))
+        elif kind < 0.8:
+            extent = rng.choice((None, rng.uniform(-full, full)))
+            steps = rng.choice((None, rng.randint(3, 12)))
+            result.append(("circle", (rng.uniform(-60, 60), extent, steps)))
+        elif kind < 0.86:
+            result.append(("dot", (rng.randint(1, 25),)))
+        elif kind < 0.92:
+            result.append(("setheading", (rng.uniform(0, full),)))
+        elif kind < 0.96:
+            result.append(("penup", ()))
+        else:
+            result.append(("pendown", ()))
+    return result
+
+
+def replay(t, seed, mode):
+    """Carry out the commands of a reference drawing, the way mode draws
+    them, and yield the index and name of each command that raised"""
+    todo = commands(seed)
+    i = 0
+    while i < len(todo):
+        name, args = todo[i]
+        try:
+            if mode == "path" and name == "goto":
+                # a run of gotos is one path
+                points = [args]
+                while i + len(points) < len(todo) and todo[i + len(points)][0] == "goto":
+                    points.append(todo[i + len(points)][1])
+                t.path(points)
+                i += len(points) - 1
+            elif mode == "draw_segments" and name == "goto" and t.isdown():
+                t.draw_segments([tuple(t.pos()) + args])
+                t.penup()
+                t.goto(*args)
+                t.pendown()
+            else:
+                getattr(t, name)(*args)
+        except Exception as err:  # errors are part of the result, too
+            yield f"{i} {name}: {type(err).__name__}"
+        i += 1
+
+
+def draw(module, seed, mode="direct"):
+    """Make a reference drawing and return its canvas and the errors raised"""
+    if mode in {"draw_segments", "worker", "parallel"}:
+        import adafruit_turtle_host
+
+        t = adafruit_turtle_host.turtle(Display(160, 128))
+    else:
+        t = module.turtle(Display(160, 128))
+    if mode == "worker":
+        t.start_render_worker()
+    elif mode == "parallel":
+        t.start_recording()
+    elif mode in {"segmentcache", "skipunchanged", "fixedpoint"}:
+        getattr(t, mode)()
+    # some commands print their progress
+    with contextlib.redirect_stdout(io.StringIO()):
+        errors = list(replay(t, seed, mode))
+    if mode == "worker":
+        t.join()
+    elif mode == "parallel":
+        t.render_parallel()
+    return t._fg_bitmap, errors
+
+
+def pixels(bitmap):
+    return bytes(bitmap[x, y] for y in range(bitmap.height) for x in range(bitmap.width))
+
+
+def digest(mode, seed):
+    """The hash of the canvas and the errors of one reference drawing"""
+    bitmap, errors = draw(adafruit_turtle, seed, mode)
+    return hashlib.sha1(pixels(bitmap) + "\n".join(errors).encode()).hexdigest()
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_drawings_match_the_reference(mode):
+    hashes_file = FIXEDPOINT_HASHES if mode == "fixedpoint" else HASHES
+    with open(hashes_file) as file:
+        expected = json.load(file)
+    differ = [
+        (seed, commands(seed))
+        for seed in range(min(COUNT, len(expected)))
+        if digest(mode, seed) != expected[seed]
+    ]
+    assert not differ
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record the reference drawing hashes")
+    parser.add_argument("--update", action="store_true", help="record the hashes again")
+    parser.add_argument("--count", type=int, default=300, help="how many drawings to make")
+    args = parser.parse_args()
+    if not args.update:
+        parser.error("run the checks with pytest")
+    for mode, hashes_file in (("direct", HASHES), ("fixedpoint", FIXEDPOINT_HASHES)):
+        with open(hashes_file, "w") as file:
+            json.dump([digest(mode, seed) for seed in range(args.count)], file, indent=0)
+            file.write("\n")
+    print(f"recorded {args.count} hashes for each of direct and fixedpoint")
+
+
+if __name__ == "__main__":
+    main()
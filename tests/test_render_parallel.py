@@ -0,0 +1,69 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+import random
+
+import pytest
+
+import adafruit_turtle
+import adafruit_turtle_host
+from adafruit_turtle_host import _BandRaster
+
+
+@pytest.mark.parametrize("clips", [True, False])
+def test_bands_draw_the_pixels_of_the_whole_line(clips):
+    rng = random.Random(1)
+    width, height = 40, 30
+    for _ in range(300):
+        line = [
+            rng.randint(-20, 60),
+            rng.randint(-20, 50),
+            rng.randint(-20, 60),
+            rng.randint(-20, 50),
+        ]
+        pen = (5, rng.randint(1, 6), rng.uniform(0, 360), rng.random() < 0.5)
+        whole = bytearray(b"\xff" * width * height)
+        raster = _BandRaster(whole, width, height, 0, height, clips)
+        adafruit_turtle.turtle._raster_line(raster, *line, *pen)
+        bands = bytearray(b"\xff" * width * height)
+        for top in range(0, height, 7):
+            _BandRaster(bands, width, height, top, top + 7, clips)._raster_line(*line, *pen)
+        assert bands == whole
+
+
+def pixels(t):
+    return [t._fg_bitmap[x, y] for y in range(t._h) for x in range(t._w)]
+
+
+def draw(t, clear):
+    t.speed(0)
+    t.pendown()
+    t.pensize(3)
+    t.forward(20)
+    if clear:
+        t.clear()
+    t.left(90)
+    t.forward(10)
+
+
+def test_clear_while_recording_drops_the_recorded_strokes(display):
+    direct = adafruit_turtle_host.turtle(display)
+    draw(direct, True)
+    recorded = adafruit_turtle_host.turtle(display)
+    recorded.start_recording()
+    draw(recorded, True)
+    recorded.render_parallel(2)
+    assert pixels(recorded) == pixels(direct)
+
+
+def test_drawing_on_the_canvas_while_recording_raises(display):
+    t = adafruit_turtle_host.turtle(display)
+    t.start_recording()
+    draw(t, False)
+    with pytest.raises(RuntimeError):
+        t.draw_segments([(0, 0, 10, 10)])
+    with pytest.raises(RuntimeError):
+        t.snapshot()
+    t.render_parallel(2)
+    t.draw_segments([(0, 0, 10, 10)])
@@ -0,0 +1,47 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+import adafruit_turtle_host
+
+
+def fail():
+    raise ZeroDivisionError
+
+
+def test_flush_raises_the_error_of_a_queued_command(display):
+    t = adafruit_turtle_host.turtle(display)
+    t.speed(0)
+    t.start_render_worker()
+    t._render_queue.put((fail, ()))
+    with pytest.raises(ZeroDivisionError):
+        t.flush()
+    # the worker is still running and draws again
+    t.pendown()
+    t.forward(10)
+    t.flush()
+    assert t._fg_bitmap[t._w // 2 + 5, t._h // 2] == 1
+    t.join()
+
+
+def test_join_raises_the_error_of_a_queued_command(display):
+    t = adafruit_turtle_host.turtle(display)
+    t.start_render_worker()
+    t._render_queue.put((fail, ()))
+    with pytest.raises(ZeroDivisionError):
+        t.join()
+    assert t._render_queue is None
+
+
+def test_the_next_drawing_call_raises_the_error(display):
+    t = adafruit_turtle_host.turtle(display)
+    t.speed(0)
+    t.pendown()
+    t.start_render_worker()
+    t._render_queue.put((fail, ()))
+    t._render_queue.commands.join()
+    with pytest.raises(ZeroDivisionError):
+        t.forward(10)
+    t.join()
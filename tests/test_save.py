@@ -0,0 +1,36 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+import io
+
+import pytest
+
+from adafruit_turtle import Color, turtle
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.mark.parametrize("format", ["bmp", "png"])
+@pytest.mark.parametrize("bit_depth", [1, 2, 4])
+def test_saved_image_has_the_canvas_colors(display, format, bit_depth):
+    t = turtle(display, bit_depth=bit_depth)
+    t.speed(0)
+    t.pendown()
+    for i, color in enumerate((Color.RED, Color.GREEN, Color.BLUE, Color.WHITE)):
+        t.pensize(1 + i)
+        t.pencolor(color)
+        t.forward(20 + 3 * i)
+        t.left(100)
+    stream = io.BytesIO()
+    t.save(stream, format)
+    stream.seek(0)
+    image = Image.open(stream)
+    assert image.format.lower() == format
+    assert image.size == (t._w, t._h)
+    rgb = image.convert("RGB")
+    assert len(rgb.getcolors()) > 1
+    for y in range(t._h):
+        for x in range(t._w):
+            c = t._colors[t._fg_bitmap[x, y]]
+            assert rgb.getpixel((x, y)) == (c >> 16, (c >> 8) & 0xFF, c & 0xFF)
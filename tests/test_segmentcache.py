@@ -0,0 +1,45 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+from adafruit_turtle import Color, turtle
+
+
+def draw(display, cache):
+    t = turtle(display)
+    t.speed(0)
+    if cache:
+        t.segmentcache()
+    rastered = []
+    raster_line = t._raster_line
+
+    def counted(*args):
+        rastered.append(args[:4])
+        raster_line(*args)
+
+    t._raster_line = counted
+    t.pensize(3)
+    t.pendown()
+    for _ in range(5):
+        for _ in range(4):
+            t.forward(15)
+            t.left(90)
+    # a line in another color could cover the square
+    t.pencolor(Color.RED)
+    t.goto(15, 15)
+    t.pencolor(Color.WHITE)
+    t.goto(0, 0)
+    for _ in range(4):
+        t.forward(15)
+        t.left(90)
+    pixels = [t._fg_bitmap[x, y] for y in range(t._h) for x in range(t._w)]
+    return pixels, rastered
+
+
+def test_retraced_segments_are_skipped_until_something_else_is_drawn(display):
+    pixels, rastered = draw(display, False)
+    cached_pixels, cached_rastered = draw(display, True)
+    assert cached_pixels == pixels
+    assert len(rastered) == 4 * 5 + 2 + 4
+    # the square once, the two diagonals, then the square again
+    assert len(cached_rastered) == 4 + 2 + 4
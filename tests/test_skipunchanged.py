@@ -0,0 +1,35 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+import displayio
+
+from adafruit_turtle import turtle
+
+
+def draw(display, skip):
+    t = turtle(display)
+    t.speed(0)
+    t.skipunchanged(skip)
+    t.pendown()
+    t.pensize(6)
+    for _ in range(6):
+        t.forward(25)
+        t.left(110)
+    return [t._fg_bitmap[x, y] for y in range(t._h) for x in range(t._w)]
+
+
+def test_skipping_writes_fewer_pixels_for_the_same_drawing(display, monkeypatch):
+    writes = [0]
+    setitem = displayio.Bitmap.__setitem__
+
+    def counted(self, index, value):
+        writes[0] += 1
+        setitem(self, index, value)
+
+    monkeypatch.setattr(displayio.Bitmap, "__setitem__", counted)
+    every = draw(display, False)
+    written = writes[0]
+    writes[0] = 0
+    assert draw(display, True) == every
+    assert writes[0] < written
@@ -0,0 +1,60 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+import io
+
+import pytest
+
+import adafruit_turtle
+
+
+def draw(t):
+    t.speed(0)
+    t.pendown()
+    for i in range(12):
+        t.pensize(1 + i % 4)
+        t.pencolor(adafruit_turtle.Color.colors[1 + i % 15])
+        t.forward(90)
+        t.left(131)
+
+
+def pixels(t):
+    return [t._fg_bitmap[x, y] for y in range(t._h) for x in range(t._w)]
+
+
+@pytest.mark.parametrize("raw", ["file", "stream", "rle"])
+def test_tiled_canvas_round_trip(display, tmp_path, raw):
+    t = adafruit_turtle.turtle(display, canvas_size=(200, 150))
+    assert isinstance(t._fg_bitmap, adafruit_turtle.TiledCanvas)
+    draw(t)
+    t.bgcolor(adafruit_turtle.Color.BLUE)
+    expected = pixels(t)
+    state = (tuple(t.pos()), t.heading(), t.pensize(), t.pencolor(), t.bgcolor())
+    if raw == "file":
+        source = str(tmp_path / "canvas.snap")
+        t.snapshot(source)
+    elif raw == "stream":
+        source = io.BytesIO()
+        t.snapshot(source)
+        source.seek(0)
+    else:
+        source = t.snapshot()
+    t.reset()
+    t.pensize(5)
+    t.forward(40)
+    t.restore(source)
+    assert pixels(t) == expected
+    assert (tuple(t.pos()), t.heading(), t.pensize(), t.pencolor(), t.bgcolor()) == state
+
+
+def test_a_fractional_pen_size_is_kept(display):
+    t = adafruit_turtle.turtle(display)
+    t.pensize(2.5)
+    snapshot = t.snapshot()
+    t.pensize(7)
+    t.restore(snapshot)
+    assert t.pensize() == 2.5
+    t.pensize(3)
+    t.restore(t.snapshot())
+    assert isinstance(t.pensize(), int)
@@ -0,0 +1,123 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+import math
+import random
+
+import pytest
+
+from adafruit_turtle_host import turtle
+
+
+def point_distance(px, py, x0, y0, x1, y1):
+    dx = x1 - x0
+    dy = y1 - y0
+    length = dx * dx + dy * dy
+    t = 0 if length == 0 else max(0, min(1, ((px - x0) * dx + (py - y0) * dy) / length))
+    return math.hypot(px - x0 - t * dx, py - y0 - t * dy)
+
+
+def crosses(a, b):
+    def side(x0, y0, x1, y1, px, py):
+        return (x1 - x0) * (py - y0) - (y1 - y0) * (px - x0)
+
+    return side(*b, *a[:2]) * side(*b, *a[2:]) < 0 and side(*a, *b[:2]) * side(*a, *b[2:]) < 0
+
+
+def apart(a, b):
+    if crosses(a, b):
+        return 0
+    return min(
+        point_distance(*a[:2], *b),
+        point_distance(*a[2:], *b),
+        point_distance(*b[:2], *a),
+        point_distance(*b[2:], *a),
+    )
+
+
+def in_box(line, left, bottom, right, top):
+    if any(left <= x <= right and bottom <= y <= top for x, y in (line[:2], line[2:])):
+        return True
+    edges = (
+        (left, bottom, right, bottom),
+        (right, bottom, right, top),
+        (right, top, left, top),
+        (left, top, left, bottom),
+    )
+    return any(apart(line, edge) == 0 for edge in edges)
+
+
+def draw(display, rng, undo=False):
+    """Draw random lines and dots on the canvas, and return them as
+    (x0, y0, x1, y1, half the pen size) in the order drawn"""
+    t = turtle(display)
+    t.speed(0)
+    t.hideturtle()
+    t.spatialindex(8)
+    if undo:
+        t.setundobuffer(100)
+    drawn = []
+    x = y = 0
+    for _ in range(40):
+        if rng.random() < 0.2:
+            size = rng.randint(1, 7)
+            t.dot(size)
+            drawn.append((x, y, x, y, size / 2))
+            continue
+        t.pensize(rng.randint(1, 4))
+        t.pendown()
+        nx, ny = rng.randint(-30, 30), rng.randint(-22, 22)
+        t.goto(nx, ny)
+        drawn.append((x, y, nx, ny, t.pensize() / 2))
+        x, y = nx, ny
+    return t, drawn
+
+
+def check_queries(t, drawn, rng):
+    for _ in range(200):
+        x0, x1 = rng.uniform(-31, 31), rng.uniform(-31, 31)
+        y0, y1 = rng.uniform(-23, 23), rng.uniform(-23, 23)
+        hits = [item[:4] for item in drawn if apart((x0, y0, x1, y1), item[:4]) < item[4] + 0.5]
+        assert t.hits(x0, y0, x1, y1) == hits
+        region = [
+            item[:4]
+            for item in drawn
+            if in_box(
+                item[:4],
+                min(x0, x1) - item[4],
+                min(y0, y1) - item[4],
+                max(x0, x1) + item[4],
+                max(y0, y1) + item[4],
+            )
+        ]
+        assert t.region(x0, y0, x1, y1) == region
+        nearest = min(max(0, point_distance(x0, y0, *item[:4]) - item[4]) for item in drawn)
+        assert t.nearest(x0, y0)[1] == pytest.approx(nearest)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_queries_match_a_scan_of_everything_drawn(display, seed):
+    rng = random.Random(seed)
+    t, drawn = draw(display, rng)
+    check_queries(t, drawn, rng)
+
+
+def test_undo_takes_lines_out_of_the_index(display):
+    rng = random.Random(7)
+    t, drawn = draw(display, rng, undo=True)
+    # each line is a pensize(), a pendown() and a goto(); each dot one action
+    for _ in range(12):
+        item = drawn.pop()
+        for _ in range(1 if item[:2] == item[2:4] else 3):
+            t.undo()
+    check_queries(t, drawn, rng)
+
+
+def test_draw_segments_indexes_and_draws_a_generator(display):
+    t = turtle(display)
+    t.speed(0)
+    t.spatialindex(8)
+    t.draw_segments((x, -10, x, 10) for x in (-20, 0, 20))
+    assert t.region(-30, -20, 30, 20) == [(-20, -10, -20, 10), (0, -10, 0, 10), (20, -10, 20, 10)]
+    assert t._fg_bitmap[t._w // 2, t._h // 2] == t._pencolor
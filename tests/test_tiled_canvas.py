@@ -0,0 +1,38 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+import displayio
+import pytest
+
+import adafruit_turtle
+from adafruit_turtle import TiledCanvas
+
+
+def canvas(max_tiles):
+    return TiledCanvas(256, 256, 64, 48, displayio.Palette(2), 2, 32, max_tiles)
+
+
+def test_max_tiles_must_leave_a_tile_beside_the_view():
+    # the view needs 3 x 3 tiles, scrolled to any offset
+    with pytest.raises(ValueError):
+        canvas(9)
+
+
+def test_drawing_off_screen_with_the_fewest_tiles():
+    c = canvas(10)
+    for y in range(0, 256, 32):
+        for x in range(0, 256, 32):
+            c[x, y] = 1
+    assert all(c[x, y] == 1 for y in range(0, 256, 32) for x in range(0, 256, 32))
+
+
+def test_stamps_follow_the_view(display):
+    t = adafruit_turtle.turtle(display, canvas_size=(200, 150))
+    t.speed(0)
+    t.forward(20)
+    stamp = t._stamps[t.stamp()]
+    # centered on the turtle, in view coordinates
+    assert (stamp.x, stamp.y) == (int(t._x) - t._view_x - 4, int(t._y) - t._view_y - 4)
+    t.viewport(30, -10)
+    assert (stamp.x, stamp.y) == (int(t._x) - t._view_x - 4, int(t._y) - t._view_y - 4)
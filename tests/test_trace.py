@@ -0,0 +1,29 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+import io
+import json
+
+from adafruit_turtle_host import turtle
+
+
+def test_calls_on_the_render_worker_are_traced_too(display):
+    t = turtle(display)
+    t.start_trace(4096)
+    t.speed(0)
+    t.pendown()
+    t.start_render_worker()
+    for _ in range(50):
+        t.forward(10)
+        t.left(37)
+    t.join()
+    t.stop_trace()
+    assert "forward" not in t.__dict__
+    stream = io.BytesIO()
+    t.save_trace(stream)
+    events = json.loads(stream.getvalue())["traceEvents"]
+    assert len(events) == t._trace_count
+    names = {(event["name"], event["tid"]) for event in events}
+    assert ("forward", 0) in names
+    assert ("_raster_line", 1) in names
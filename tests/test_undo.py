@@ -0,0 +1,96 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+from adafruit_turtle import Color, turtle
+
+
+def drawn(t):
+    return sum(t._fg_bitmap[x, y] != 0 for y in range(t._h) for x in range(t._w))
+
+
+def test_undo_after_a_no_op_keeps_the_drawing(display):
+    t = turtle(display)
+    t.speed(0)
+    t.setundobuffer(10)
+    t.pendown()
+    t.forward(20)
+    pixels = drawn(t)
+    t.forward(0)
+    t.undo()
+    assert drawn(t) == pixels
+
+
+def test_pen_changes_are_undone_one_at_a_time(display):
+    t = turtle(display)
+    t.setundobuffer(10)
+    t.pendown()
+    t.pensize(3)
+    t.pencolor(Color.RED)
+    assert t.undobufferentries() == 3
+    t.undo()
+    assert (t.pencolor(), t.pensize(), t.isdown()) == (Color.WHITE, 3, True)
+    t.undo()
+    assert t.pensize() == 1
+    t.undo()
+    assert not t.isdown()
+
+
+def test_reset_empties_the_undo_buffer(display):
+    t = turtle(display)
+    t.setundobuffer(10)
+    t.forward(5)
+    t.reset()
+    assert t.undobufferentries() == 0
+
+
+def pixels(t):
+    return [t._fg_bitmap[x, y] for y in range(t._h) for x in range(t._w)]
+
+
+def test_undo_restores_pixels_written_twice_in_one_action(display):
+    t = turtle(display)
+    t.speed(0)
+    t.setundobuffer(10)
+    t.pendown()
+    t.pencolor(Color.RED)
+    t.forward(15)
+    t.left(100)
+    before = pixels(t)
+    t.pensize(4)
+    t.pencolor(Color.BLUE)
+    # the circle crosses itself and the red line
+    t.circle(12, 720)
+    t.undo()
+    t.undo()
+    t.undo()
+    assert pixels(t) == before
+
+
+def test_a_thick_line_journals_spans_not_pixels(display):
+    t = turtle(display)
+    t.speed(0)
+    t.setundobuffer(10)
+    t.pendown()
+    t.pensize(10)
+    t.goto(-30, 0)
+    t.forward(60)
+    # about two bytes for every three pixels, not eight for each
+    changed = sum(value != 0 for value in pixels(t))
+    assert t._undo_bytes < changed
+
+
+def test_the_oldest_actions_are_dropped_past_the_memory_allowed(display):
+    t = turtle(display)
+    t.speed(0)
+    t.setundobuffer(100, memory=200)
+    t.pendown()
+    t.pensize(3)
+    for _ in range(8):
+        t.forward(20)
+        t.left(45)
+    assert 0 < t.undobufferentries() < 16
+    assert t._undo_bytes <= 200
+    while t.undobufferentries():
+        t.undo()
+    assert t._undo_bytes == 0